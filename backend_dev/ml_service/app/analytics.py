@@ -0,0 +1,180 @@
+"""
+Airline analytics behind /display.
+
+All dashboard blocks are built as one Polars lazy plan over the parquet
+dataset: the airline filter and the handful of columns used are pushed down
+into the scan, and every aggregation is collected together with collect_all.
+The plan runs on the streaming engine by default, so it also works on the
+full, unreduced flights parquet.
+
+By default every airline's dashboard is computed once into an in-memory
+cache and /display becomes a dict lookup.
+"""
+import os
+import pickle
+import threading
+import time
+
+import polars as pl
+
+from app.constants import DAY_MAP
+
+ANALYTICS_PATH = os.getenv("ANALYTICS_PATH", "./app/flights_processed_for_analytics_reduced.parquet")
+# Polars engine: "streaming", "in-memory" or "auto"
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "streaming")
+
+COLUMNS = [
+    "AIRLINE", "ORIGIN_AIRPORT", "DESTINATION_AIRPORT", "ARRIVAL_DELAY",
+    "FLIGHT_NUMBER", "DAY_OF_WEEK", "TAXI_OUT", "SCHEDULED_DEPARTURE",
+]
+
+BLOCKS = [
+    "worst_routes", "worst_flights", "delay_by_day", "top_airports",
+    "losing_routes", "vulnerable_days", "taxiout_vs_delay", "hour_vs_delay",
+]
+
+SCATTER_SAMPLE = 500
+
+
+def _top(lf: pl.LazyFrame, by: str, n: int, keys: list) -> pl.LazyFrame:
+    """
+    Top n rows per airline by a column, largest first, nulls last.
+    Ties are broken on the group keys so results are deterministic.
+    """
+    return (
+        lf.sort(["AIRLINE", by, *keys], descending=[False, True] + [False] * len(keys), nulls_last=True)
+        .group_by("AIRLINE", maintain_order=True)
+        .head(n)
+    )
+
+
+def report_queries(lf: pl.LazyFrame, airline: str = None) -> dict:
+    """
+    Lazy queries for every dashboard block, keyed by block name. Each result
+    keeps an AIRLINE column; with `airline` set the filter is applied first
+    so the scan only reads that airline's rows.
+    """
+    if airline is not None:
+        lf = lf.filter(pl.col("AIRLINE") == airline)
+    lf = lf.select(COLUMNS).with_columns(
+        pl.col("ARRIVAL_DELAY").cast(pl.Float64).fill_nan(None),
+        pl.col("TAXI_OUT").cast(pl.Float64).fill_nan(None),
+    )
+    delay = pl.col("ARRIVAL_DELAY")
+    route = pl.concat_str([pl.col("ORIGIN_AIRPORT"), pl.col("DESTINATION_AIRPORT")], separator=" → ")
+
+    by_route = lf.group_by(["AIRLINE", "ORIGIN_AIRPORT", "DESTINATION_AIRPORT"]).agg(
+        delay.mean().alias("avg_arrival_delay"),
+        (delay.mean() * delay.count()).alias("impact"),
+    ).with_columns(route.alias("route"))
+
+    queries = {}
+
+    # 1. Top 3 Worst Flight Paths
+    queries["worst_routes"] = _top(by_route, "avg_arrival_delay", 3, ["route"]).select(
+        "AIRLINE", "route", "avg_arrival_delay"
+    )
+
+    # 2. Top 3 Worst Flights
+    queries["worst_flights"] = _top(
+        lf.group_by(["AIRLINE", "FLIGHT_NUMBER"]).agg(delay.mean().alias("avg_arrival_delay")),
+        "avg_arrival_delay", 3, ["FLIGHT_NUMBER"],
+    ).select("AIRLINE", pl.col("FLIGHT_NUMBER").alias("flight"), "avg_arrival_delay")
+
+    # 3. Average Delay by Day of Week (6. Vulnerability reuses it)
+    queries["delay_by_day"] = (
+        lf.group_by(["AIRLINE", "DAY_OF_WEEK"])
+        .agg(delay.mean().alias("avg_arrival_delay"))
+        .sort(["AIRLINE", "DAY_OF_WEEK"])
+        .select(
+            "AIRLINE",
+            pl.col("DAY_OF_WEEK").replace_strict(DAY_MAP, default=None, return_dtype=pl.String).alias("day"),
+            "avg_arrival_delay",
+        )
+    )
+
+    # 4. Top 10 Airports by Avg Arrival Delay
+    queries["top_airports"] = _top(
+        lf.group_by(["AIRLINE", "DESTINATION_AIRPORT"]).agg(delay.mean().alias("avg_arrival_delay")),
+        "avg_arrival_delay", 10, ["DESTINATION_AIRPORT"],
+    ).select("AIRLINE", pl.col("DESTINATION_AIRPORT").alias("airport"), "avg_arrival_delay")
+
+    # 5. Top 10 Losing Routes (money impact approx: delay × count)
+    queries["losing_routes"] = _top(by_route, "impact", 10, ["route"]).select("AIRLINE", "route", "impact")
+
+    # 7. Scatter: Taxi-Out vs Arrival Delay
+    queries["taxiout_vs_delay"] = (
+        lf.select("AIRLINE", pl.col("TAXI_OUT").alias("taxi_out"), delay.alias("arrival_delay"))
+        .drop_nulls()
+        .group_by("AIRLINE")
+        .agg(pl.all().shuffle(seed=42).head(SCATTER_SAMPLE))
+        .explode(["taxi_out", "arrival_delay"])
+    )
+
+    # 8. Hour of Day vs Avg Delay
+    queries["hour_vs_delay"] = (
+        lf.group_by(["AIRLINE", (pl.col("SCHEDULED_DEPARTURE") // 100).cast(pl.Int64).alias("hour")])
+        .agg(delay.mean().alias("avg_arrival_delay"))
+        .sort(["AIRLINE", "hour"])
+    )
+    return queries
+
+
+def empty_report() -> dict:
+    return {block: [] for block in BLOCKS}
+
+
+def collect_reports(lf: pl.LazyFrame, airline: str = None, engine: str = ANALYTICS_ENGINE) -> dict:
+    """Run all block queries in one collect_all and split the results per airline."""
+    queries = report_queries(lf, airline)
+    frames = pl.collect_all(list(queries.values()), engine=engine)
+
+    reports = {}
+    for block, frame in zip(queries, frames):
+        for (name,), part in frame.partition_by("AIRLINE", as_dict=True, maintain_order=True).items():
+            reports.setdefault(name, empty_report())[block] = part.drop("AIRLINE").to_dicts()
+    for report in reports.values():
+        report["vulnerable_days"] = report["delay_by_day"]
+    return reports
+
+
+def airline_report(path: str, airline: str, engine: str = ANALYTICS_ENGINE) -> dict:
+    """All dashboard blocks for one airline, straight from the parquet file."""
+    reports = collect_reports(pl.scan_parquet(path), airline, engine)
+    return reports.get(airline, empty_report())
+
+
+class AnalyticsCache:
+    """Per-airline dashboard results, rebuilt as a whole on load()."""
+
+    def __init__(self, path: str = ANALYTICS_PATH, engine: str = ANALYTICS_ENGINE):
+        self.path = path
+        self.engine = engine
+        self._reports = None
+        self._lock = threading.Lock()
+        self.stats = {"loaded": False}
+
+    @property
+    def loaded(self) -> bool:
+        return self._reports is not None
+
+    def load(self) -> dict:
+        """Compute every airline's report in one pass over the dataset."""
+        t0 = time.perf_counter()
+        reports = collect_reports(pl.scan_parquet(self.path), engine=self.engine)
+        t1 = time.perf_counter()
+
+        with self._lock:
+            self._reports = reports
+            self.stats = {
+                "loaded": True,
+                "path": self.path,
+                "engine": self.engine,
+                "airlines": len(reports),
+                "build_seconds": round(t1 - t0, 3),
+                "cache_bytes": len(pickle.dumps(reports)),
+            }
+        return self.stats
+
+    def get(self, airline: str) -> dict:
+        return self._reports.get(airline, empty_report())
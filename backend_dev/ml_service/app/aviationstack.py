@@ -0,0 +1,140 @@
+"""
+Shared async client for the AviationStack /v1/flights API.
+
+One pooled httpx.AsyncClient (keep-alive, timeouts) is opened in the app
+lifespan. Lookups are cached per flight number for a TTL (at most
+max_cached flights, oldest evicted first), and concurrent lookups of the
+same flight share a single upstream request.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+import httpx
+
+from app import metrics
+from app.metrics import Histogram
+
+
+class UpstreamError(RuntimeError):
+    pass
+
+
+class AviationStackClient:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 10.0,
+        cache_ttl: float = 300.0,
+        max_connections: int = 20,
+        max_cached: int = 10000,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.max_connections = max_connections
+        self.max_cached = max_cached
+        self._client = None
+        # flight -> (expires, record), oldest first since every entry has the same TTL
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.hits = self.misses = self.coalesced = 0
+        self.upstream_calls = self.upstream_errors = 0
+        self.upstream_ms = Histogram([5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000])
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def flight(self, flight_number: str):
+        """
+        First AviationStack record for a flight number, or None if there is
+        none. Raises UpstreamError when the API cannot be reached or fails.
+        """
+        key = flight_number.strip().upper()
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: a cancelled caller must not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: str):
+        await self.start()
+        self.upstream_calls += 1
+        t0 = time.perf_counter()
+        try:
+            response = await self._client.get(
+                self.base_url, params={"access_key": self.api_key, "flight_number": key}
+            )
+        except httpx.HTTPError as e:
+            self.upstream_errors += 1
+            raise UpstreamError(f"AviationStack request failed: {e!r}") from e
+        finally:
+            elapsed = time.perf_counter() - t0
+            self.upstream_ms.observe(elapsed * 1000)
+            metrics.observe_stage("upstream_api", elapsed)
+
+        if response.status_code != 200:
+            self.upstream_errors += 1
+            raise UpstreamError(f"AviationStack returned HTTP {response.status_code}")
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        # Errors such as an exhausted quota can come back as HTTP 200 with an
+        # "error" object; only a "data" list means the lookup succeeded
+        if not isinstance(body, dict) or not isinstance(body.get("data"), list):
+            self.upstream_errors += 1
+            error = body.get("error") if isinstance(body, dict) else None
+            raise UpstreamError(f"AviationStack returned no flight data: {error or response.text[:200]!r}")
+        data = body["data"]
+        flight = data[0] if data else None
+        self._store(key, flight)
+        return flight
+
+    def _store(self, key: str, flight):
+        now = time.monotonic()
+        self._cache.pop(key, None)
+        while self._cache and next(iter(self._cache.values()))[0] <= now:
+            self._cache.popitem(last=False)
+        while len(self._cache) >= self.max_cached:
+            self._cache.popitem(last=False)
+        self._cache[key] = (now + self.cache_ttl, flight)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached_flights": len(self._cache),
+            "cache_ttl": self.cache_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "upstream_ms": self.upstream_ms.snapshot(),
+        }
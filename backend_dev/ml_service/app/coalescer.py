@@ -0,0 +1,159 @@
+"""
+Micro-batching for single-row predictions.
+
+Concurrent /predict-mojo requests are queued; the first request of a batch
+waits at most `window_ms` for more to arrive (or until `max_batch` are
+queued), then the whole batch is scored in one model call and each caller
+gets its own result back. Batch sizes and queue waits are kept as
+histograms; queue waits are also the "batch_queue_wait" stage in /metrics.
+Rows whose caller gave up before their batch was scored are dropped.
+"""
+import asyncio
+import contextvars
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+from app.metrics import Histogram, observe_stage
+from app.server_timing import current_profile, profile_thread
+
+
+class _Pending:
+    __slots__ = ("row", "future", "enqueued", "profile")
+
+    def __init__(self, row, future, enqueued, profile):
+        self.row = row
+        self.future = future
+        self.enqueued = enqueued
+        # Profile of the submitting request; batches run outside its context
+        self.profile = profile
+
+
+class BatchCoalescer:
+    """
+    Collects rows submitted concurrently and scores them together with
+    score_batch(rows) -> predictions, run in the threadpool. At most
+    max_inflight batches are scored at the same time.
+    """
+
+    def __init__(self, score_batch, window_ms: float = 2.0, max_batch: int = 64, max_inflight: int = 4):
+        self.score_batch = score_batch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.max_inflight = max_inflight
+        self.batch_size = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.queue_wait_ms = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000])
+        self.score_ms = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000])
+        self._queue = None
+        self._full = None
+        self._slots = None
+        self._task = None
+        # Batches being scored; the loop itself only holds weak references
+        self._scoring = set()
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._full = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_inflight)
+            # Fresh context: the collector outlives the request that started it
+            self._task = asyncio.create_task(self._collect(), context=contextvars.Context())
+
+    async def stop(self):
+        """Stop collecting, let batches being scored finish, fail rows still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            if self._scoring:
+                await asyncio.gather(*self._scoring, return_exceptions=True)
+            while not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError("Batch coalescer stopped"))
+
+    async def submit(self, row):
+        """Queue one row and wait for its prediction."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        pending = _Pending(row, loop.create_future(), loop.time(), current_profile())
+        self._queue.put_nowait(pending)
+        if self._queue.qsize() >= self.max_batch:
+            self._full.set()
+        return await pending.future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch, collected = [], False
+            try:
+                batch.append(await self._queue.get())
+                wait = self.window - (loop.time() - batch[0].enqueued)
+                if wait > 0 and self._queue.qsize() < self.max_batch - 1:
+                    self._full.clear()
+                    try:
+                        await asyncio.wait_for(self._full.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                await self._slots.acquire()
+                collected = True
+            finally:
+                # Stopped while holding rows taken off the queue: fail them
+                # rather than leave their callers waiting
+                if not collected:
+                    for p in batch:
+                        if not p.future.done():
+                            p.future.set_exception(RuntimeError("Batch coalescer stopped"))
+
+            # Rows whose caller was cancelled meanwhile are not scored
+            batch = [p for p in batch if not p.future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._score(batch))
+            self._scoring.add(task)
+            task.add_done_callback(self._scoring.discard)
+
+    def _score_rows(self, batch: list) -> list:
+        with profile_thread(*{p.profile for p in batch if p.profile is not None}):
+            return self.score_batch([p.row for p in batch])
+
+    async def _score(self, batch: list):
+        try:
+            started = asyncio.get_running_loop().time()
+            self.batch_size.observe(len(batch))
+            for p in batch:
+                self.queue_wait_ms.observe((started - p.enqueued) * 1000)
+                observe_stage("batch_queue_wait", started - p.enqueued)
+            t0 = time.perf_counter()
+            preds = await run_in_threadpool(self._score_rows, batch)
+            self.score_ms.observe((time.perf_counter() - t0) * 1000)
+            for p, pred in zip(batch, preds):
+                if not p.future.done():
+                    p.future.set_result(pred)
+        except Exception as e:
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(e)
+        finally:
+            # No caller is left waiting, even if scoring was cancelled or
+            # returned fewer predictions than rows
+            for p in batch:
+                if not p.future.done():
+                    p.future.set_exception(RuntimeError("Batch was not scored"))
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batch_size": self.batch_size.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "score_ms": self.score_ms.snapshot(),
+        }
@@ -0,0 +1,8 @@
+"""
+Lookup tables shared by the analytics modules, kept free of heavy imports.
+"""
+
+DAY_MAP = {
+    1: "Monday", 2: "Tuesday", 3: "Wednesday",
+    4: "Thursday", 5: "Friday", 6: "Saturday", 7: "Sunday"
+}
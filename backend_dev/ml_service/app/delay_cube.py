@@ -0,0 +1,202 @@
+"""
+Pre-aggregated delay cube for airline analytics.
+
+The build step rolls the raw flights up to sum/count of ARRIVAL_DELAY per
+(AIRLINE, ORIGIN_AIRPORT, DESTINATION_AIRPORT, FLIGHT_NUMBER, DAY_OF_WEEK,
+DEP_HOUR) and writes that cube, plus a fixed per-airline taxi-out sample, to
+small parquet files. Every /display block is then answered from those files:
+the rollups are np.bincount over per-airline group codes, with no raw rows.
+"""
+import os
+import time
+
+import numpy as np
+import polars as pl
+
+from app.analytics import COLUMNS, SCATTER_SAMPLE, empty_report
+from app.constants import DAY_MAP
+
+DELAY_CUBE_DIR = os.getenv("DELAY_CUBE_DIR", "./app/delay_cube")
+CUBE_FILE = "delay_cube.parquet"
+SAMPLE_FILE = "taxiout_sample.parquet"
+
+CUBE_KEYS = ["AIRLINE", "ORIGIN_AIRPORT", "DESTINATION_AIRPORT", "FLIGHT_NUMBER", "DAY_OF_WEEK", "DEP_HOUR"]
+
+
+def build_cube(lf: pl.LazyFrame, engine: str = "streaming"):
+    """Aggregate raw flights into (cube, taxi-out sample) DataFrames."""
+    lf = lf.select(COLUMNS).with_columns(
+        pl.col("ARRIVAL_DELAY").cast(pl.Float64).fill_nan(None),
+        pl.col("TAXI_OUT").cast(pl.Float64).fill_nan(None),
+        (pl.col("SCHEDULED_DEPARTURE") // 100).cast(pl.Int8).alias("DEP_HOUR"),
+    )
+    cube = (
+        lf.group_by(CUBE_KEYS)
+        .agg(
+            pl.col("ARRIVAL_DELAY").sum().alias("DELAY_SUM"),
+            pl.col("ARRIVAL_DELAY").count().cast(pl.Int32).alias("DELAY_COUNT"),
+        )
+        .with_columns(
+            pl.col("AIRLINE").cast(pl.Categorical),
+            pl.col("ORIGIN_AIRPORT").cast(pl.Categorical),
+            pl.col("DESTINATION_AIRPORT").cast(pl.Categorical),
+            pl.col("FLIGHT_NUMBER").cast(pl.Int32),
+            pl.col("DAY_OF_WEEK").cast(pl.Int8),
+        )
+        .sort(CUBE_KEYS[:1])
+    )
+    sample = (
+        lf.select("AIRLINE", pl.col("TAXI_OUT").alias("taxi_out"), pl.col("ARRIVAL_DELAY").alias("arrival_delay"))
+        .drop_nulls()
+        .group_by("AIRLINE")
+        .agg(pl.all().shuffle(seed=42).head(SCATTER_SAMPLE))
+        .explode(["taxi_out", "arrival_delay"])
+    )
+    return pl.collect_all([cube, sample], engine=engine)
+
+
+def write_cube(source: str, out_dir: str = DELAY_CUBE_DIR) -> dict:
+    """Build the cube from a raw flights parquet and write it to out_dir."""
+    t0 = time.perf_counter()
+    cube, sample = build_cube(pl.scan_parquet(source))
+    os.makedirs(out_dir, exist_ok=True)
+    cube.write_parquet(os.path.join(out_dir, CUBE_FILE))
+    sample.write_parquet(os.path.join(out_dir, SAMPLE_FILE))
+    source_rows = pl.scan_parquet(source).select(pl.len()).collect().item()
+    return {
+        "source_rows": source_rows,
+        "source_bytes": os.path.getsize(source),
+        "cube_rows": cube.height,
+        "cube_bytes": os.path.getsize(os.path.join(out_dir, CUBE_FILE)),
+        "sample_rows": sample.height,
+        "build_seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def _rollup(codes: np.ndarray, n: int, sums: np.ndarray, counts: np.ndarray):
+    """Mean and sum of ARRIVAL_DELAY per group code; NaN mean for empty groups."""
+    s = np.bincount(codes, weights=sums, minlength=n)
+    c = np.bincount(codes, weights=counts, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(c > 0, s / c, np.nan)
+    return mean, np.where(c > 0, s, np.nan)
+
+
+def _top(values: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the n largest values, NaN last, ties in label order."""
+    key = np.where(np.isnan(values), np.inf, -values)
+    return np.argsort(key, kind="stable")[:n]
+
+
+def _num(x) -> float:
+    return None if np.isnan(x) else float(x)
+
+
+class _AirlineCube:
+    """One airline's slice of the cube with a group code per rollup key."""
+
+    def __init__(self, part: pl.DataFrame):
+        self.sums = part["DELAY_SUM"].fill_null(0).to_numpy().astype(np.float64)
+        self.counts = part["DELAY_COUNT"].to_numpy().astype(np.float64)
+
+        routes = (
+            part["ORIGIN_AIRPORT"].cast(pl.String) + " → " + part["DESTINATION_AIRPORT"].cast(pl.String)
+        ).to_numpy()
+        self.route_labels, self.route_codes = np.unique(routes, return_inverse=True)
+        self.flight_labels, self.flight_codes = np.unique(part["FLIGHT_NUMBER"].to_numpy(), return_inverse=True)
+        self.dest_labels, self.dest_codes = np.unique(
+            part["DESTINATION_AIRPORT"].cast(pl.String).to_numpy(), return_inverse=True
+        )
+        self.dow_labels, self.dow_codes = np.unique(part["DAY_OF_WEEK"].to_numpy(), return_inverse=True)
+        self.hour_labels, self.hour_codes = np.unique(part["DEP_HOUR"].to_numpy(), return_inverse=True)
+
+    def rollup(self, key: str):
+        labels = getattr(self, f"{key}_labels")
+        mean, total = _rollup(getattr(self, f"{key}_codes"), len(labels), self.sums, self.counts)
+        return labels, mean, total
+
+
+class DelayCube:
+    """Query layer answering the /display rollups from the delay cube."""
+
+    def __init__(self, cube_dir: str = DELAY_CUBE_DIR):
+        self.cube_dir = cube_dir
+        self._airlines = None
+        self._samples = None
+        self.stats = {"loaded": False}
+
+    @property
+    def loaded(self) -> bool:
+        return self._airlines is not None
+
+    def load(self) -> dict:
+        t0 = time.perf_counter()
+        cube_path = os.path.join(self.cube_dir, CUBE_FILE)
+        cube = pl.read_parquet(cube_path)
+        sample = pl.read_parquet(os.path.join(self.cube_dir, SAMPLE_FILE))
+
+        airlines = {
+            str(name): _AirlineCube(part)
+            for (name,), part in cube.partition_by("AIRLINE", as_dict=True).items()
+        }
+        samples = {
+            str(name): part.drop("AIRLINE").to_dicts()
+            for (name,), part in sample.partition_by("AIRLINE", as_dict=True).items()
+        }
+        self._airlines, self._samples = airlines, samples
+        self.stats = {
+            "loaded": True,
+            "path": self.cube_dir,
+            "cube_rows": cube.height,
+            "cube_bytes": os.path.getsize(cube_path),
+            "airlines": len(airlines),
+            "load_seconds": round(time.perf_counter() - t0, 3),
+        }
+        return self.stats
+
+    def report(self, airline: str) -> dict:
+        cube = self._airlines.get(airline)
+        if cube is None:
+            return empty_report()
+        results = {}
+
+        # 1. Top 3 Worst Flight Paths / 5. Top 10 Losing Routes
+        labels, mean, total = cube.rollup("route")
+        results["worst_routes"] = [
+            {"route": str(labels[i]), "avg_arrival_delay": _num(mean[i])} for i in _top(mean, 3)
+        ]
+
+        # 2. Top 3 Worst Flights
+        flights, fmean, _ = cube.rollup("flight")
+        results["worst_flights"] = [
+            {"flight": int(flights[i]), "avg_arrival_delay": _num(fmean[i])} for i in _top(fmean, 3)
+        ]
+
+        # 3. Average Delay by Day of Week
+        days, dmean, _ = cube.rollup("dow")
+        results["delay_by_day"] = [
+            {"day": DAY_MAP.get(int(d)), "avg_arrival_delay": _num(m)} for d, m in zip(days, dmean)
+        ]
+
+        # 4. Top 10 Airports by Avg Arrival Delay
+        airports, amean, _ = cube.rollup("dest")
+        results["top_airports"] = [
+            {"airport": str(airports[i]), "avg_arrival_delay": _num(amean[i])} for i in _top(amean, 10)
+        ]
+
+        results["losing_routes"] = [
+            {"route": str(labels[i]), "impact": _num(total[i])} for i in _top(total, 10)
+        ]
+
+        # 6. Vulnerability by Day of Week
+        results["vulnerable_days"] = results["delay_by_day"]
+
+        # 7. Scatter: Taxi-Out vs Arrival Delay (precomputed sample)
+        results["taxiout_vs_delay"] = self._samples.get(airline, [])
+
+        # 8. Hour of Day vs Avg Delay
+        hours, hmean, _ = cube.rollup("hour")
+        results["hour_vs_delay"] = [
+            {"hour": int(h), "avg_arrival_delay": _num(m)} for h, m in zip(hours, hmean)
+        ]
+        return results
@@ -0,0 +1,139 @@
+"""
+Historical average arrival delays per route, airline and flight number.
+
+The store is built once from the analytics parquet (build_feature_store.py) and
+saved as a small .npz file: for each feature, an array of interned keys and a
+parallel float64 array of mean ARRIVAL_DELAY. On load every key is interned to
+its array position, so a request resolves each distinct key with one dict
+lookup instead of grouping and merging the request frame.
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+FEATURE_STORE_PATH = os.getenv("FEATURE_STORE_PATH", "./app/feature_store.npz")
+
+# feature column -> key it is averaged over
+FEATURES = {
+    "ROUTE_AVG_ARR_DELAY": "ROUTE",
+    "AIRLINE_AVG_ARR_DELAY": "AIRLINE",
+    "FLIGHT_AVG_ARR_DELAY": "FLIGHT_NUMBER",
+}
+
+
+def route_keys(origin, dest) -> list:
+    """ROUTE key the model was trained on: ORIGIN_DEST."""
+    return [f"{o}_{d}" for o, d in zip(origin, dest)]
+
+
+def build_store(lf: "pl.LazyFrame", engine: str = "streaming") -> dict:
+    """Mean ARRIVAL_DELAY per key, as {feature: (keys, means)} NumPy arrays."""
+    import polars as pl
+
+    lf = lf.select(
+        pl.concat_str([pl.col("ORIGIN_AIRPORT"), pl.col("DESTINATION_AIRPORT")], separator="_").alias("ROUTE"),
+        pl.col("AIRLINE").cast(pl.String),
+        pl.col("FLIGHT_NUMBER").cast(pl.Int64),
+        pl.col("ARRIVAL_DELAY").cast(pl.Float64).fill_nan(None),
+    )
+    queries = [
+        lf.group_by(key).agg(pl.col("ARRIVAL_DELAY").mean()).drop_nulls().sort(key)
+        for key in FEATURES.values()
+    ]
+    tables = {}
+    for feature, frame in zip(FEATURES, pl.collect_all(queries, engine=engine)):
+        key = FEATURES[feature]
+        keys = frame[key].to_numpy()
+        if keys.dtype == object:
+            keys = keys.astype(str)
+        tables[feature] = (keys, frame["ARRIVAL_DELAY"].to_numpy().astype(np.float64))
+    return tables
+
+
+def write_store(source: str, out_path: str = FEATURE_STORE_PATH) -> dict:
+    """Rebuild the store from a raw flights parquet and save it to out_path."""
+    import polars as pl
+
+    t0 = time.perf_counter()
+    tables = build_store(pl.scan_parquet(source))
+    arrays = {}
+    for feature, (keys, means) in tables.items():
+        arrays[f"{feature}.keys"] = keys
+        arrays[f"{feature}.values"] = means
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(out_path, "wb") as f:
+        np.savez(f, **arrays)
+    return {
+        "source": source,
+        "keys": {feature: len(keys) for feature, (keys, _) in tables.items()},
+        "store_bytes": os.path.getsize(out_path),
+        "build_seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+class FeatureStore:
+    """Interned key -> historical mean delay lookups, loaded from the .npz file."""
+
+    def __init__(self, path: str = FEATURE_STORE_PATH):
+        self.path = path
+        self._codes = None
+        self._values = None
+        self.stats = {"loaded": False}
+
+    @property
+    def loaded(self) -> bool:
+        return self._codes is not None
+
+    def load(self) -> dict:
+        t0 = time.perf_counter()
+        codes, values = {}, {}
+        with np.load(self.path) as npz:
+            for feature in FEATURES:
+                keys = npz[f"{feature}.keys"].tolist()
+                codes[feature] = {key: i for i, key in enumerate(keys)}
+                # Trailing NaN is what unknown keys (code -1) resolve to
+                values[feature] = np.append(npz[f"{feature}.values"], np.nan)
+        self._codes, self._values = codes, values
+        self.stats = {
+            "loaded": True,
+            "path": self.path,
+            "keys": {feature: len(c) for feature, c in codes.items()},
+            "load_seconds": round(time.perf_counter() - t0, 3),
+        }
+        return self.stats
+
+    def lookup(self, feature: str, keys) -> np.ndarray:
+        """Historical means for an array of keys; NaN where a key is unknown."""
+        codes = self._codes[feature]
+        return self._values[feature][[codes.get(key, -1) for key in keys]]
+
+    def features(self, df: pd.DataFrame) -> dict:
+        """
+        All stored features for a raw flights frame, keyed by column name.
+        Request keys are interned first, so each distinct key is hashed once.
+        """
+        origin, origins = pd.factorize(df["ORIGIN_AIRPORT"])
+        dest, dests = pd.factorize(df["DESTINATION_AIRPORT"])
+        # One code per (origin, dest) pair; -1 where either airport is missing
+        pair = np.where((origin < 0) | (dest < 0), -1, origin * len(dests) + dest)
+        pair, pairs = pd.factorize(pair)
+        origins, dests = np.asarray(origins), np.asarray(dests)
+        # None (unknown, so NaN) where an airport is missing
+        routes = np.full(len(pairs), None, dtype=object)
+        known = pairs >= 0
+        if known.any():
+            routes[known] = route_keys(origins[pairs[known] // len(dests)], dests[pairs[known] % len(dests)])
+
+        out = {}
+        for feature, (codes, uniques) in {
+            "ROUTE_AVG_ARR_DELAY": (pair, routes),
+            "AIRLINE_AVG_ARR_DELAY": pd.factorize(df["AIRLINE"]),
+            "FLIGHT_AVG_ARR_DELAY": pd.factorize(df["FLIGHT_NUMBER"]),
+        }.items():
+            values = np.append(self.lookup(feature, uniques), np.nan)
+            out[feature] = values[codes]
+        return out
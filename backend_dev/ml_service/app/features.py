@@ -0,0 +1,92 @@
+"""
+Feature engineering for raw flight data (Set B -> Set A).
+
+Every feature is computed column-wise with NumPy/pandas operations instead of
+per-row Python callbacks, so the cost grows with the number of distinct dates
+and groups rather than with the number of rows.
+"""
+import numpy as np
+import pandas as pd
+
+from app.holiday_calendar import day_ordinals, get_calendar
+
+DISTANCE_BINS = [0, 500, 1500, 3000, np.inf]
+DISTANCE_LABELS = ["short", "medium", "long", "ultra"]
+
+
+def holiday_flags(df: pd.DataFrame) -> np.ndarray:
+    """1 where (YEAR, MONTH, DAY) is a US holiday, else 0; missing dates are 0."""
+    return get_calendar().is_holiday(day_ordinals(df["YEAR"], df["MONTH"], df["DAY"]))
+
+
+def days_to_holiday(df: pd.DataFrame) -> np.ndarray:
+    """Days from (YEAR, MONTH, DAY) to the nearest US holiday; NaN if missing."""
+    return get_calendar().days_to_nearest(day_ordinals(df["YEAR"], df["MONTH"], df["DAY"]))
+
+
+def minutes_of_day(hhmm) -> np.ndarray:
+    """HHMM clock values -> minutes since midnight; non-numeric cells become NaN."""
+    t = np.trunc(pd.to_numeric(pd.Series(hhmm), errors="coerce").to_numpy(dtype=np.float64))
+    return (t // 100) * 60 + t % 100
+
+
+def dep_time_diff(scheduled, actual) -> pd.Series:
+    """
+    Minutes between scheduled and actual departure. An actual time earlier
+    in the day than the scheduled one is taken as next day (overnight).
+    """
+    sched = minutes_of_day(scheduled)
+    act = minutes_of_day(actual)
+    act = np.where(act < sched, act + 24 * 60, act)
+    diff = act - sched
+    if not np.isnan(diff).any():
+        return pd.Series(diff.astype(np.int64))
+    return pd.Series(diff)
+
+
+def engineer_features(df: pd.DataFrame, store=None, holiday_distance: bool = False) -> pd.DataFrame:
+    """
+    Add the engineered model features to a raw flights frame and drop the
+    helper columns. The input frame is left untouched. With a loaded
+    FeatureStore the average-delay features come from historical data;
+    holiday_distance adds the experimental DAYS_TO_HOLIDAY column.
+    """
+    df = df.reset_index(drop=True).copy()
+
+    # ------------------------------
+    # 1. Holiday feature
+    df["is_holiday"] = holiday_flags(df)
+    if holiday_distance:
+        df["DAYS_TO_HOLIDAY"] = days_to_holiday(df)
+
+    # ------------------------------
+    # 2. Red-eye feature (NaN hours compare False -> 0)
+    dep_hour = df["SCHEDULED_DEPARTURE"] // 100
+    df["is_redeye"] = ((dep_hour >= 22) | (dep_hour < 6)).astype(np.int64)
+
+    # ------------------------------
+    # 3. Departure time difference, with overnight wraparound
+    df["DEP_TIME_DIFF"] = dep_time_diff(df["SCHEDULED_DEPARTURE"], df["DEPARTURE_TIME"])
+
+    # ------------------------------
+    # 4-6. Avg arrival delay per route / airline / flight number: historical
+    # values from the feature store, else averaged over the frame itself
+    if store is not None:
+        for col, values in store.features(df).items():
+            df[col] = values
+    else:
+        route = df["ORIGIN_AIRPORT"] + "_" + df["DESTINATION_AIRPORT"]
+        delay = df["ARRIVAL_DELAY"]
+        df["ROUTE_AVG_ARR_DELAY"] = delay.groupby(route).transform("mean")
+        df["AIRLINE_AVG_ARR_DELAY"] = delay.groupby(df["AIRLINE"]).transform("mean")
+        df["FLIGHT_AVG_ARR_DELAY"] = delay.groupby(df["FLIGHT_NUMBER"]).transform("mean")
+
+    # ------------------------------
+    # 7. Weekend feature
+    df["is_weekend"] = df["DAY_OF_WEEK"].isin([6, 7]).astype(np.int64)
+
+    # ------------------------------
+    # 8. Distance buckets
+    df["DISTANCE_BUCKET"] = pd.cut(df["DISTANCE"], bins=DISTANCE_BINS, labels=DISTANCE_LABELS)
+
+    return df.drop(columns=["YEAR"])
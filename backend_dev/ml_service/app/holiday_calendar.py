@@ -0,0 +1,139 @@
+"""
+Precomputed US holiday calendar for feature engineering.
+
+Holidays for the supported years are generated once and kept as a sorted array
+of day ordinals (days since 1970-01-01), expanded once into a dense per-day
+table of the distance to the nearest holiday, so a batch only converts its
+YEAR/MONTH/DAY columns to ordinals (a month-start table lookup) and gathers
+from that table, for both the is_holiday flag and the days-to-nearest-holiday
+variant.
+"""
+import os
+import threading
+
+import holidays
+import numpy as np
+import pandas as pd
+
+# Years covered up front; a batch outside this range extends the table
+HOLIDAY_YEARS = range(
+    int(os.getenv("HOLIDAY_FIRST_YEAR", "2010")), int(os.getenv("HOLIDAY_LAST_YEAR", "2035")) + 1
+)
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _int_column(values):
+    """Column as int64 plus a validity mask; missing or non-numeric cells are invalid."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int64, copy=False), None
+    arr = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+    valid = ~np.isnan(arr)
+    return np.where(valid, arr, 1).astype(np.int64), valid
+
+
+def day_ordinals(year, month, day) -> np.ndarray:
+    """
+    Days since 1970-01-01 for YEAR/MONTH/DAY columns, as float64 with NaN
+    where any part is missing. Impossible dates raise ValueError, like
+    pd.to_datetime does.
+    """
+    (y, vy), (m, vm), (d, vd) = _int_column(year), _int_column(month), _int_column(day)
+    masks = [v for v in (vy, vm, vd) if v is not None]
+    valid = np.logical_and.reduce(masks) if masks else None
+    if len(y) == 0:
+        return np.empty(0, dtype=np.float64)
+
+    # First day and length of every month between the batch's min and max year
+    first_year = int(y.min() if valid is None else y[valid].min(initial=1970))
+    last_year = int(y.max() if valid is None else y[valid].max(initial=1970))
+    months = np.arange((first_year - 1970) * 12, (last_year - 1969) * 12 + 1).astype("datetime64[M]")
+    starts = (months.astype("datetime64[D]") - _EPOCH).astype(np.int64)
+    lengths = np.diff(starts)
+
+    in_range = (m >= 1) & (m <= 12)
+    idx = np.where(in_range, (y - first_year) * 12 + (m - 1), 0)
+    if valid is not None:
+        idx[~valid] = 0
+    bad = ~in_range | (d < 1) | (d > lengths[idx])
+    if valid is not None:
+        bad &= valid
+    if bad.any():
+        i = int(np.flatnonzero(bad)[0])
+        raise ValueError(f"invalid date {y[i]}-{m[i]}-{d[i]} at row {i}")
+
+    days = (starts[idx] + d - 1).astype(np.float64)
+    if valid is not None:
+        days[~valid] = np.nan
+    return days
+
+
+class HolidayCalendar:
+    """
+    Sorted holiday day ordinals for a range of years, expanded into a dense
+    per-day table of the distance to the nearest holiday (0 on holidays).
+    """
+
+    def __init__(self, years=HOLIDAY_YEARS):
+        self._lock = threading.Lock()
+        self._build(set(years))
+
+    def _build(self, years: set):
+        years = set(range(min(years), max(years) + 1))
+        dates = holidays.country_holidays("US", years=sorted(years)).keys()
+        ordinals = (np.array(sorted(dates), dtype="datetime64[D]") - _EPOCH).astype(np.int64)
+
+        first = (np.datetime64(f"{min(years)}-01-01", "D") - _EPOCH).astype(np.int64)
+        last = (np.datetime64(f"{max(years) + 1}-01-01", "D") - _EPOCH).astype(np.int64)
+        span = np.arange(first, last)
+        i = np.searchsorted(ordinals, span)
+        after = ordinals[np.minimum(i, len(ordinals) - 1)]
+        before = ordinals[np.maximum(i - 1, 0)]
+        distance = np.minimum(np.abs(after - span), np.abs(span - before))
+
+        self._table = (first, distance.astype(np.int16))
+        self.ordinals = ordinals
+        self.years = frozenset(years)
+
+    def _distances(self, days: np.ndarray) -> np.ndarray:
+        """Nearest-holiday distance per day ordinal, extending the table if needed."""
+        missing = np.isnan(days)
+        filled = np.where(missing, 0, days).astype(np.int64)
+        first, distance = self._table
+        idx = filled - first
+        outside = (idx < 0) | (idx >= len(distance))
+        if (outside & ~missing).any():
+            new_days = filled[outside & ~missing].astype("datetime64[D]")
+            years = new_days.astype("datetime64[Y]").astype(np.int64) + 1970
+            with self._lock:
+                # Neighbouring years so distances around New Year stay right
+                self._build(self.years | {int(years.min()) - 1, int(years.max()) + 1})
+            first, distance = self._table
+            idx = filled - first
+        idx[missing] = 0
+        out = distance[idx].astype(np.float64)
+        out[missing] = np.nan
+        return out
+
+    def is_holiday(self, days: np.ndarray) -> np.ndarray:
+        """1 where the day ordinal is a holiday, else 0; NaN days are 0."""
+        return (self._distances(days) == 0).astype(np.int64)
+
+    def days_to_nearest(self, days: np.ndarray) -> np.ndarray:
+        """Absolute distance in days to the closest holiday; NaN for NaN days."""
+        return self._distances(days)
+
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+
+def get_calendar() -> HolidayCalendar:
+    """Process-wide calendar, built on first use."""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = HolidayCalendar()
+    return _calendar
@@ -0,0 +1,347 @@
+"""
+Background jobs for large CSV uploads.
+
+POST /jobs/predict-from-csv and /jobs/store-into-db save the upload under
+JOB_DIR and return a job ID straight away. Worker processes then run the
+job chunk by chunk, doing exactly what the synchronous endpoint does, and
+append each chunk's NDJSON output (as with ?stream=true) to the job's
+result file. Jobs are rows of batch_jobs, so SQLite or Postgres is the
+only queue:
+
+    queued -> running -> done | failed
+
+A worker claims the oldest queued job with a compare-and-set UPDATE and
+heartbeats while it runs it; a running job whose heartbeat is older than
+JOB_STALE_SECONDS (its worker died) is claimed again. After each chunk the
+job's progress (rows done, result file size) is committed, in the same
+transaction as the chunk's rows for /store-into-db jobs; the worker
+updates the job row, checking it still owns the job, before it writes the
+chunk's output, and holds that row lock until the commit. A resumed job
+cuts the result file back to the committed size, reads the input again and
+continues with the first record that was not committed. On SIGTERM a
+worker finishes its chunk and puts the job back in the queue.
+
+Workers run as their own service, next to the API:
+
+    python -m app.jobs --workers 2
+
+    JOB_DIR             uploads and results (./jobs), shared by all workers
+    JOB_WORKERS         worker processes also started with the app (0)
+    JOB_POLL_SECONDS    idle wait between queue polls (1)
+    JOB_STALE_SECONDS   heartbeat age after which a job is reclaimed (60)
+"""
+import argparse
+import asyncio
+import datetime
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+
+import pandas as pd
+from sqlalchemy import and_, func, or_, select, update
+from starlette.concurrency import run_in_threadpool
+
+from databases.database import AsyncSessionLocal
+from databases.models import BatchJob
+
+JOB_DIR = os.getenv("JOB_DIR", "./jobs")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "60"))
+
+T = BatchJob.__table__
+
+
+def utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def input_path(job_id: str) -> str:
+    return os.path.join(JOB_DIR, f"{job_id}.csv")
+
+
+def result_path(job_id: str) -> str:
+    return os.path.join(JOB_DIR, f"{job_id}.ndjson")
+
+
+# ------------------------------
+# Submitting and polling
+
+def save_upload(src, job_id: str):
+    """
+    Copy an uploaded CSV to the job's input file.
+    Returns its header columns and number of data lines.
+    """
+    os.makedirs(JOB_DIR, exist_ok=True)
+    newlines, last = 0, b"\n"
+    with open(input_path(job_id), "wb") as out:
+        while block := src.read(1 << 20):
+            out.write(block)
+            newlines += block.count(b"\n")
+            last = block[-1:]
+    try:
+        header = pd.read_csv(input_path(job_id), nrows=0).columns.tolist()
+    except pd.errors.EmptyDataError:
+        header = []
+    return header, max(newlines + (last != b"\n") - 1, 0)
+
+
+async def create(db, job_id: str, kind: str, filename: str, chunk_rows: int, total_rows: int) -> dict:
+    job = dict(
+        id=job_id, kind=kind, status="queued", filename=filename,
+        chunk_rows=chunk_rows, total_rows=total_rows, rows_done=0, chunks_done=0,
+        result_bytes=0, processing_seconds=0.0, attempts=0, worker=None, error=None,
+        created_at=utcnow(), started_at=None, heartbeat_at=None, finished_at=None,
+    )
+    await db.execute(T.insert().values(job))
+    await db.commit()
+    return job
+
+
+async def get(db, job_id: str):
+    return (await db.execute(select(T).where(T.c.id == job_id))).mappings().first()
+
+
+def progress(job) -> dict:
+    """What a client polls: status, rows done, rows/sec and ETA."""
+    rate = job["rows_done"] / job["processing_seconds"] if job["processing_seconds"] else None
+    remaining = max(job["total_rows"] - job["rows_done"], 0)
+    active = job["status"] in ("queued", "running")
+    return {
+        "id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "total_rows": job["total_rows"],
+        "rows_done": job["rows_done"],
+        "chunks_done": job["chunks_done"],
+        "rows_per_sec": round(rate, 1) if rate else None,
+        "eta_seconds": round(remaining / rate, 1) if rate and active else None,
+        "attempts": job["attempts"],
+        "worker": job["worker"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "result": f"/jobs/{job['id']}/result" if job["status"] == "done" else None,
+    }
+
+
+# ------------------------------
+# Workers
+
+class LostJob(Exception):
+    """The job was reclaimed by another worker."""
+
+
+def write_at(path: str, offset: int, data: bytes):
+    """Write data at offset, dropping anything after it, and sync to disk."""
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class JobWorker:
+    """
+    Runs jobs one at a time. `handlers` maps a job kind to
+    `async handler(db, df, offset, record)`, which processes one chunk and
+    commits; `record(db, lines)` must be awaited before that commit.
+    """
+
+    def __init__(self, handlers: dict, name: str = None):
+        self.handlers = handlers
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = None
+
+    async def run(self):
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stopping.set)
+        print(f"[INFO] Job worker {self.name} started")
+        while not self.stopping.is_set():
+            job = await self.claim()
+            if job is not None:
+                await self.run_job(job)
+                continue
+            try:
+                await asyncio.wait_for(self.stopping.wait(), JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+        print(f"[INFO] Job worker {self.name} stopped")
+
+    async def claim(self):
+        """The oldest queued (or abandoned) job, now owned by this worker."""
+        stale = utcnow() - datetime.timedelta(seconds=JOB_STALE_SECONDS)
+        async with AsyncSessionLocal() as db:
+            candidates = (await db.execute(
+                select(T.c.id, T.c.status, T.c.heartbeat_at)
+                .where(or_(T.c.status == "queued", and_(T.c.status == "running", T.c.heartbeat_at < stale)))
+                .order_by(T.c.created_at)
+                .limit(10)
+            )).all()
+            for job_id, status, heartbeat_at in candidates:
+                now = utcnow()
+                claimed = await db.execute(
+                    update(T)
+                    .where(T.c.id == job_id, T.c.status == status, T.c.heartbeat_at.is_not_distinct_from(heartbeat_at))
+                    .values(status="running", worker=self.name, heartbeat_at=now,
+                            started_at=func.coalesce(T.c.started_at, now), attempts=T.c.attempts + 1)
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    return dict(await get(db, job_id))
+        return None
+
+    async def run_job(self, job: dict):
+        resumed = f" from row {job['rows_done']}" if job["rows_done"] else ""
+        print(f"[INFO] Job {job['id']} ({job['kind']}) claimed by {self.name}{resumed}")
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            finished = await self._run_chunks(job)
+            await self._release(job, "done" if finished else "queued")
+            print(f"[INFO] Job {job['id']} {'done' if finished else 'requeued'} at row {job['rows_done']}")
+        except LostJob:
+            print(f"[WARN] Job {job['id']} was reclaimed by another worker")
+        except Exception as e:
+            print(f"[WARN] Job {job['id']} failed:", e)
+            await self._release(job, "failed", error=str(e))
+        finally:
+            heartbeat.cancel()
+
+    async def _run_chunks(self, job: dict) -> bool:
+        """Process the chunks not yet committed; False if stopped before the end."""
+        reader = await run_in_threadpool(pd.read_csv, input_path(job["id"]), chunksize=job["chunk_rows"])
+        # Committed records are parsed again and dropped: skiprows counts
+        # lines, and a quoted field can span several of them
+        skip = job["rows_done"]
+        try:
+            while not self.stopping.is_set():
+                df = await run_in_threadpool(next, reader, None)
+                if df is None:
+                    return True
+                if skip:
+                    df, skip = df.iloc[skip:], max(skip - len(df), 0)
+                    if df.empty:
+                        continue
+                await self._run_chunk(job, df)
+            return False
+        finally:
+            reader.close()
+
+    async def _run_chunk(self, job: dict, df: pd.DataFrame):
+        t0 = time.perf_counter()
+        committed = {}
+
+        async def record(db, lines: str):
+            data = lines.encode()
+            values = dict(
+                rows_done=job["rows_done"] + len(df),
+                chunks_done=job["chunks_done"] + 1,
+                result_bytes=job["result_bytes"] + len(data),
+                processing_seconds=job["processing_seconds"] + time.perf_counter() - t0,
+            )
+            owned = await db.execute(
+                update(T).where(T.c.id == job["id"], T.c.worker == self.name).values(heartbeat_at=utcnow(), **values)
+            )
+            if owned.rowcount != 1:
+                raise LostJob(job["id"])
+            # The job row stays locked until this chunk commits, so no other
+            # worker can reclaim the job while its result file is written
+            await run_in_threadpool(write_at, result_path(job["id"]), job["result_bytes"], data)
+            committed.update(values)
+
+        async with AsyncSessionLocal() as db:
+            await self.handlers[job["kind"]](db, df, job["rows_done"], record)
+        if not committed:
+            raise RuntimeError(f"{job['kind']} handler did not record its chunk")
+        job.update(committed)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(JOB_STALE_SECONDS / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(T).where(T.c.id == job_id, T.c.worker == self.name).values(heartbeat_at=utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"[WARN] Heartbeat of job {job_id} failed:", e)
+
+    async def _release(self, job: dict, status: str, error: str = None):
+        done = status in ("done", "failed")
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(T).where(T.c.id == job["id"], T.c.worker == self.name).values(
+                    status=status, error=error, worker=None, heartbeat_at=None,
+                    finished_at=utcnow() if done else None,
+                )
+            )
+            await db.commit()
+        if done:
+            await run_in_threadpool(_remove, input_path(job["id"]))
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def worker_main():
+    """Entry point of a worker process: runs jobs with the app's chunk handlers."""
+    from app.main import JOB_HANDLERS
+    asyncio.run(JobWorker(JOB_HANDLERS).run())
+
+
+def _spawn(name: str):
+    worker = multiprocessing.get_context("spawn").Process(target=worker_main, name=name, daemon=True)
+    worker.start()
+    return worker
+
+
+def start_workers(n: int = JOB_WORKERS) -> list:
+    return [_spawn(f"job-worker-{i}") for i in range(n)]
+
+
+def stop_workers(workers: list, timeout: float = 30):
+    """SIGTERM the workers (each finishes its chunk), then wait for them."""
+    for w in workers:
+        w.terminate()
+    for w in workers:
+        w.join(timeout)
+        if w.is_alive():
+            w.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (1 runs in this process)")
+    args = parser.parse_args()
+    if args.workers == 1:
+        worker_main()
+        return
+
+    # Supervise the workers: replace any that die, stop them all on SIGTERM/SIGINT
+    stopping = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopping.set())
+    workers = start_workers(args.workers)
+    while not stopping.wait(JOB_POLL_SECONDS):
+        for i, w in enumerate(workers):
+            if not w.is_alive():
+                print(f"[WARN] Job worker {w.name} exited with code {w.exitcode}; restarting it")
+                workers[i] = _spawn(w.name)
+    stop_workers(workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Lazily initialized subsystems and the startup-time report.
+
+Optional parts of the service (the H2O cluster, analytics datasets, the
+feature store) are wrapped in Lazy so importing app.main stays cheap: each is
+built on first use, or warmed up at startup when enabled by configuration.
+How long the import and every subsystem took is kept in STARTUP_REPORT.
+
+A factory that fails is not run again for LAZY_RETRY_SECONDS (30); until
+then get() re-raises the same error without calling it.
+"""
+import os
+import threading
+import time
+
+LAZY_RETRY_SECONDS = float(os.getenv("LAZY_RETRY_SECONDS", "30"))
+
+STARTUP_REPORT = {"import_seconds": None, "startup_seconds": None, "subsystems": {}}
+
+
+class Lazy:
+    """A subsystem built by `factory` once, on the first get(); thread-safe."""
+
+    def __init__(self, name: str, factory, retry_seconds: float = None):
+        self.name = name
+        self.factory = factory
+        self.retry_seconds = LAZY_RETRY_SECONDS if retry_seconds is None else retry_seconds
+        self._value = None
+        self._ready = False
+        # (error, monotonic time before which it is re-raised) of the last failure
+        self._failed = None
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def get(self):
+        if not self._ready:
+            self._raise_failed()
+            with self._lock:
+                if not self._ready:
+                    self._raise_failed()
+                    t0 = time.perf_counter()
+                    try:
+                        self._value = self.factory()
+                    except Exception as e:
+                        self._failed = (e, time.monotonic() + self.retry_seconds)
+                        STARTUP_REPORT["subsystems"][self.name] = {"ready": False, "error": str(e)}
+                        raise
+                    self._ready, self._failed = True, None
+                    STARTUP_REPORT["subsystems"][self.name] = {
+                        "ready": True,
+                        "init_seconds": round(time.perf_counter() - t0, 3),
+                    }
+        return self._value
+
+    def _raise_failed(self):
+        failed = self._failed
+        if failed is not None and time.monotonic() < failed[1]:
+            # Drop the old traceback so it does not grow on every re-raise
+            raise failed[0].with_traceback(None)
+
+    def get_or_none(self):
+        """get(), but None if the subsystem cannot be initialized."""
+        try:
+            return self.get()
+        except Exception:
+            return None
+
+    def reset(self):
+        """Drop the built value so the next get() rebuilds it; returns the old one."""
+        with self._lock:
+            value, self._value, self._ready, self._failed = self._value, None, False, None
+        return value
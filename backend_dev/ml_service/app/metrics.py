@@ -0,0 +1,190 @@
+"""
+Request and stage metrics in Prometheus text format.
+
+MetricsMiddleware keeps a latency histogram, a request counter and an
+in-flight gauge per route template; stage() times the steps inside a request
+(CSV parse, validation, feature engineering, model scoring, DB write,
+upstream API calls). Everything is plain counters under one lock, cheap
+enough to stay on in production; /metrics renders it with render().
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+from starlette.routing import Match
+
+from app.server_timing import record_span
+
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+STAGE_BUCKETS = [0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+_lock = threading.Lock()
+_request_seconds = {}   # (method, route) -> Histogram
+_requests = {}          # (method, route, status) -> count
+_in_flight = {}         # (method, route) -> count
+_stage_seconds = {}     # stage -> Histogram
+_route_cache = {}       # path -> route template, static routes only
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative (le) counts."""
+
+    def __init__(self, buckets):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, total = {}, 0
+        for bound, n in zip(self.buckets + ["+Inf"], self.counts):
+            total += n
+            cumulative[str(bound)] = total
+        return {
+            "buckets": cumulative,
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else None,
+        }
+
+
+def observe_stage(stage: str, seconds: float):
+    with _lock:
+        hist = _stage_seconds.get(stage)
+        if hist is None:
+            hist = _stage_seconds[stage] = Histogram(STAGE_BUCKETS)
+        hist.observe(seconds)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Time the enclosed block as stage `name` (also around awaits); it is also
+    a Server-Timing span of the current request.
+    """
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        observe_stage(name, elapsed)
+        record_span(name, elapsed)
+
+
+# ------------------------------
+# Per-route HTTP metrics
+
+def route_template(scope) -> str:
+    """The route path a request matches ("/store-flight/{flight_number}")."""
+    path = scope["path"]
+    cached = _route_cache.get(path)
+    if cached is not None:
+        return cached
+    template = "unmatched"
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            template = route.path
+            if match == Match.FULL:
+                break
+    # Only matched static routes: caching misses would keep every 404 path
+    if template != "unmatched" and "{" not in template:
+        _route_cache[path] = template
+    return template
+
+
+class MetricsMiddleware:
+    """ASGI middleware: latency, status and in-flight count per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        key = (scope["method"], route_template(scope))
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with _lock:
+            _in_flight[key] = _in_flight.get(key, 0) + 1
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - t0
+            with _lock:
+                _in_flight[key] -= 1
+                hist = _request_seconds.get(key)
+                if hist is None:
+                    hist = _request_seconds[key] = Histogram(LATENCY_BUCKETS)
+                hist.observe(elapsed)
+                counter = key + (status,)
+                _requests[counter] = _requests.get(counter, 0) + 1
+
+
+# ------------------------------
+# Prometheus text exposition
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def histogram_lines(name: str, hist: Histogram, **labels) -> list:
+    lines, total = [], 0
+    for bound, n in zip(hist.buckets + ["+Inf"], hist.counts):
+        total += n
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {total}")
+    lines.append(f"{name}_sum{_labels(**labels)} {hist.sum}")
+    lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+    return lines
+
+
+def header(name: str, kind: str, help_text: str) -> list:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def scalar(name: str, kind: str, help_text: str, value, **labels) -> list:
+    """A single counter or gauge sample with its HELP/TYPE header."""
+    return header(name, kind, help_text) + [f"{name}{_labels(**labels)} {value}"]
+
+
+def render(extra: list = ()) -> str:
+    """Every collected metric, plus `extra` lines, as Prometheus text."""
+    with _lock:
+        lines = header("http_requests_total", "counter", "HTTP requests by route and status.")
+        for (method, route, status), n in sorted(_requests.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {n}")
+
+        lines += header("http_requests_in_flight", "gauge", "HTTP requests being served.")
+        for (method, route), n in sorted(_in_flight.items()):
+            lines.append(f"http_requests_in_flight{_labels(method=method, route=route)} {n}")
+
+        lines += header("http_request_duration_seconds", "histogram", "HTTP request latency by route.")
+        for (method, route), hist in sorted(_request_seconds.items()):
+            lines += histogram_lines("http_request_duration_seconds", hist, method=method, route=route)
+
+        lines += header("stage_duration_seconds", "histogram", "Time spent in each processing stage.")
+        for name, hist in sorted(_stage_seconds.items()):
+            lines += histogram_lines("stage_duration_seconds", hist, stage=name)
+
+    return "\n".join(lines + list(extra)) + "\n"
+
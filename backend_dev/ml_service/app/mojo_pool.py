@@ -0,0 +1,185 @@
+"""
+Pool of long-lived MOJO scorer processes.
+
+Each worker (app/mojo_worker.py) loads the MOJO once inside its own JVM and then
+scores batches of rows sent over its stdin/stdout pipe, so a prediction no longer
+pays for JVM startup, MOJO unzip and tree loading.
+"""
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app import metrics
+from app.server_timing import current_profile, profile_thread
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mojo_worker.py")
+
+
+class ScorerError(RuntimeError):
+    pass
+
+
+class _Worker:
+    def __init__(self, jar_path: str, mojo_path: str):
+        self.jar_path = jar_path
+        self.mojo_path = mojo_path
+        self.proc = None
+        self.restarts = 0
+
+    def spawn(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, self.jar_path, self.mojo_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    def wait_ready(self):
+        line = self.proc.stdout.readline()
+        if not line or not json.loads(line).get("ready"):
+            raise ScorerError("MOJO worker failed to start")
+
+    def restart(self):
+        self.kill()
+        self.restarts += 1
+        self.spawn()
+        self.wait_ready()
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def score(self, rows: list) -> list:
+        self.proc.stdin.write(json.dumps(rows) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise BrokenPipeError("MOJO worker exited")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ScorerError(reply["error"])
+        return reply["predictions"]
+
+    def kill(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+        self.proc = None
+
+
+class MojoScorerPool:
+    """
+    Fixed-size pool of MOJO scorer processes, one per core by default.
+
+    predict() is blocking and thread-safe; callers borrow an idle worker for the
+    duration of one batch. A worker that died (or whose pipe broke) is restarted
+    and the batch is retried once on the fresh process. close() is final: a
+    batch still running then fails instead of restarting its worker.
+    """
+
+    def __init__(self, jar_path: str, mojo_path: str, size: int = None):
+        self.jar_path = jar_path
+        self.mojo_path = mojo_path
+        self.size = size or os.cpu_count() or 1
+        self._workers = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        with self._lock:
+            if self._closed:
+                raise ScorerError("MOJO scorer pool is closed")
+            if self._workers:
+                return
+            workers = [_Worker(self.jar_path, self.mojo_path) for _ in range(self.size)]
+            # Boot all JVMs in parallel, then wait for each to report ready
+            for w in workers:
+                w.spawn()
+            for w in workers:
+                w.wait_ready()
+                self._idle.put(w)
+            self._workers = workers
+
+    def predict(self, rows: list) -> list:
+        """
+        Score a batch of rows. Each row maps column name -> cell string, the
+        same values PredictCsv would read from a CSV.
+        """
+        if not self._workers:
+            self.start()
+        idle = self._idle
+        worker = idle.get()
+        try:
+            if not worker.alive():
+                self._restart(worker)
+            with metrics.stage("model_scoring"):
+                try:
+                    return worker.score(rows)
+                except (BrokenPipeError, OSError, ValueError):
+                    self._restart(worker)
+                    return worker.score(rows)
+        finally:
+            idle.put(worker)
+
+    def _restart(self, worker: _Worker):
+        """Restart a worker, unless the pool is closed (then nothing would kill it)."""
+        if self._closed:
+            raise ScorerError("MOJO scorer pool is closed")
+        try:
+            worker.restart()
+        finally:
+            # close() may have run during the restart and missed the new process
+            with self._lock:
+                closed = self._closed
+            if closed:
+                worker.kill()
+        if closed:
+            raise ScorerError("MOJO scorer pool is closed")
+
+    def predict_frame(self, df) -> list:
+        """
+        Score a DataFrame, split into one slice per worker and scored in
+        parallel. Cells are stringified the same way as single-row requests.
+        """
+        with metrics.stage("input_encoding"):
+            rows = [
+                {col: "" if value is None or value != value else str(value) for col, value in rec.items()}
+                for rec in df.to_dict(orient="records")
+            ]
+        if not rows:
+            return []
+        step = -(-len(rows) // self.size)
+        chunks = [rows[i:i + step] for i in range(0, len(rows), step)]
+        profile = current_profile()
+
+        def predict(chunk):
+            with profile_thread(profile):
+                return self.predict(chunk)
+        with ThreadPoolExecutor(max_workers=len(chunks)) as ex:
+            results = ex.map(predict, chunks)
+        return [p for chunk in results for p in chunk]
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "alive": sum(w.alive() for w in self._workers),
+            "restarts": sum(w.restarts for w in self._workers),
+        }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            for w in self._workers:
+                w.kill()
+            self._workers = []
+            self._idle = queue.Queue()
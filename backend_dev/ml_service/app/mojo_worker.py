@@ -0,0 +1,66 @@
+"""
+Long-lived MOJO scorer process.
+
+Started by app.mojo_pool as `python mojo_worker.py <jar> <mojo>`. It boots one
+JVM through JPype, loads the MOJO once and then scores batches read from stdin,
+one JSON line per batch, writing one JSON line per result to stdout.
+
+Rows are scored exactly the way hex.genmodel.tools.PredictCsv scores them:
+same EasyPredictModelWrapper config, same handling of empty / NA cells.
+"""
+import json
+import os
+import sys
+
+import jpype
+
+# Cells PredictCsv treats as missing (see PredictCsv.formatDataRow)
+NA_CELLS = {"", "NA", "N/A", "-"}
+
+
+def load_wrapper(jar_path: str, mojo_path: str):
+    jpype.startJVM(classpath=[jar_path], convertStrings=True)
+
+    MojoModel = jpype.JClass("hex.genmodel.MojoModel")
+    EasyPredictModelWrapper = jpype.JClass("hex.genmodel.easy.EasyPredictModelWrapper")
+
+    config = (
+        EasyPredictModelWrapper.Config()
+        .setModel(MojoModel.load(mojo_path))
+        .setConvertUnknownCategoricalLevelsToNa(True)
+        .setConvertInvalidNumbersToNa(False)
+    )
+    return EasyPredictModelWrapper(config)
+
+
+def main():
+    jar_path, mojo_path = sys.argv[1], sys.argv[2]
+
+    # Keep stdout for the protocol only: anything the JVM prints goes to stderr
+    out = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    wrapper = load_wrapper(jar_path, mojo_path)
+    RowData = jpype.JClass("hex.genmodel.easy.RowData")
+
+    out.write(json.dumps({"ready": True}) + "\n")
+    out.flush()
+
+    for line in sys.stdin:
+        try:
+            rows = json.loads(line)
+            predictions = []
+            for row in rows:
+                row_data = RowData()
+                for column, value in row.items():
+                    if value not in NA_CELLS:
+                        row_data.put(column, value)
+                predictions.append(float(wrapper.predictRegression(row_data).value))
+            out.write(json.dumps({"predictions": predictions}) + "\n")
+        except Exception as e:
+            out.write(json.dumps({"error": str(e)}) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+In-process LRU + TTL cache for single-row predictions.
+
+Entries are keyed by a canonical hash of the validated FlightFeatures together
+with the digest of the active MOJO file, so a changed model can never serve a
+stale prediction. The cache is also emptied as soon as a new model digest is
+seen.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def features_key(features: dict, model_digest: str) -> str:
+    """Canonical hash of a features dict (key order independent) and the model."""
+    payload = json.dumps(features, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(f"{model_digest}\n{payload}".encode(), digest_size=16).hexdigest()
+
+
+class FileDigest:
+    """
+    SHA-256 of a file, recomputed only when its size or mtime changes. The
+    file is stat()-ed at most once per check_interval seconds.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._signature = None
+        self._digest = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def digest(self) -> str:
+        now = time.monotonic()
+        if self._digest is not None and now - self._checked_at < self.check_interval:
+            return self._digest
+        with self._lock:
+            st = os.stat(self.path)
+            signature = (st.st_size, st.st_mtime_ns)
+            if signature != self._signature:
+                h = hashlib.sha256()
+                with open(self.path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        h.update(block)
+                self._digest = h.hexdigest()
+                self._signature = signature
+            self._checked_at = now
+        return self._digest
+
+
+class PredictionCache:
+    """
+    Bounded LRU map of key -> prediction with a per-entry TTL. A size of 0
+    disables caching. Thread-safe; all counters are exposed by stats().
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_digest = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def set_model(self, digest: str) -> bool:
+        """Record the active model digest; returns True (and clears) if it changed."""
+        if digest == self.model_digest:
+            return False
+        with self._lock:
+            if digest == self.model_digest:
+                return False
+            changed = self.model_digest is not None
+            if changed:
+                self.invalidations += 1
+                self._entries.clear()
+            self.model_digest = digest
+            return changed
+
+    def get(self, key: str):
+        """Cached prediction for key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "model_digest": self.model_digest,
+        }
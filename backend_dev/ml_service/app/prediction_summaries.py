@@ -0,0 +1,153 @@
+"""
+Per-airline analytics over stored predictions, kept pre-aggregated in Postgres.
+
+Each summary table holds sum and count of ARRIVAL_DELAY_PREDICTED per
+airline and one rollup key (route, flight, day of week, departure hour,
+destination airport). /store-into-db adds every chunk's deltas to them
+with INSERT ... ON CONFLICT DO UPDATE in the chunk's own transaction, so
+the summaries always match final_db_schema and a rolled-back chunk leaves
+them untouched. Delta rows are written in key order, so concurrent chunks
+lock shared rows in the same order and cannot deadlock.
+
+/display/predictions answers the /display blocks for one airline from a few
+hundred summary rows instead of scanning final_db_schema.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import desc, select
+
+from app.constants import DAY_MAP
+from databases.models import (
+    PredictionAirportSummary,
+    PredictionDaySummary,
+    PredictionFlightSummary,
+    PredictionHourSummary,
+    PredictionRouteSummary,
+)
+
+# summary table -> its key columns after AIRLINE
+SUMMARIES = {
+    PredictionRouteSummary.__table__: ("ORIGIN_AIRPORT", "DESTINATION_AIRPORT"),
+    PredictionFlightSummary.__table__: ("FLIGHT_NUMBER",),
+    PredictionDaySummary.__table__: ("DAY_OF_WEEK",),
+    PredictionHourSummary.__table__: ("DEP_HOUR",),
+    PredictionAirportSummary.__table__: ("DESTINATION_AIRPORT",),
+}
+
+# Delta rows per INSERT, well under the driver's bind parameter limit
+UPSERT_BATCH = 1000
+
+# Stored precision of ARRIVAL_DELAY_PREDICTED (DECIMAL(20, 15)); Postgres
+# rounds ties away from zero when storing it
+STORED = Decimal("1e-15")
+
+
+def summary_deltas(records: list) -> dict:
+    """
+    Sum and count per summary key for final_db_schema records, as sorted
+    lists of rows ready to upsert.
+    """
+    deltas = {table: {} for table in SUMMARIES}
+    for r in records:
+        delay = r["ARRIVAL_DELAY_PREDICTED"].quantize(STORED, ROUND_HALF_UP)
+        values = {**r, "DEP_HOUR": int(r["SCHEDULED_DEPARTURE"]) // 100}
+        for table, keys in SUMMARIES.items():
+            key = (str(r["AIRLINE"]), *(values[k] for k in keys))
+            total, count = deltas[table].get(key, (0, 0))
+            deltas[table][key] = (total + delay, count + 1)
+    return {
+        table: [
+            {"AIRLINE": key[0], **dict(zip(SUMMARIES[table], key[1:])), "delay_sum": s, "delay_count": c}
+            for key, (s, c) in sorted(rows.items())
+        ]
+        for table, rows in deltas.items()
+    }
+
+
+async def add_to_summaries(db, records: list):
+    """Add the deltas of newly stored records to every summary table."""
+    if not records:
+        return
+    conn = await db.connection()
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    for table, rows in summary_deltas(records).items():
+        for i in range(0, len(rows), UPSERT_BATCH):
+            stmt = dialect_insert(table).values(rows[i:i + UPSERT_BATCH])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["AIRLINE", *SUMMARIES[table]],
+                set_={
+                    "delay_sum": table.c.delay_sum + stmt.excluded.delay_sum,
+                    "delay_count": table.c.delay_count + stmt.excluded.delay_count,
+                },
+            )
+            await db.execute(stmt)
+
+
+async def _rollup(db, table, airline: str, order: str = None, limit: int = None) -> list:
+    """(key..., mean, sum) per key of `table` for one airline, largest `order` first."""
+    keys = [table.c[k] for k in SUMMARIES[table]]
+    mean = (table.c.delay_sum / table.c.delay_count).label("mean")
+    query = select(*keys, mean, table.c.delay_sum.label("total")).where(table.c.AIRLINE == airline)
+    if order is not None:
+        query = query.order_by(desc(order), *keys).limit(limit)
+    else:
+        query = query.order_by(*keys)
+    return (await db.execute(query)).all()
+
+
+def _num(x) -> float:
+    return None if x is None else float(x)
+
+
+async def airline_report(db, airline: str) -> dict:
+    """The /display blocks for one airline, computed from the summary tables."""
+    routes, flights = PredictionRouteSummary.__table__, PredictionFlightSummary.__table__
+    days, hours = PredictionDaySummary.__table__, PredictionHourSummary.__table__
+    airports = PredictionAirportSummary.__table__
+    results = {}
+
+    # 1. Top 3 Worst Flight Paths
+    results["worst_routes"] = [
+        {"route": f"{o} → {d}", "avg_arrival_delay": _num(m)}
+        for o, d, m, _ in await _rollup(db, routes, airline, "mean", 3)
+    ]
+
+    # 2. Top 3 Worst Flights
+    results["worst_flights"] = [
+        {"flight": int(f), "avg_arrival_delay": _num(m)}
+        for f, m, _ in await _rollup(db, flights, airline, "mean", 3)
+    ]
+
+    # 3. Average Delay by Day of Week
+    results["delay_by_day"] = [
+        {"day": DAY_MAP.get(int(d)), "avg_arrival_delay": _num(m)}
+        for d, m, _ in await _rollup(db, days, airline)
+    ]
+
+    # 4. Top 10 Airports by Avg Arrival Delay
+    results["top_airports"] = [
+        {"airport": a, "avg_arrival_delay": _num(m)}
+        for a, m, _ in await _rollup(db, airports, airline, "mean", 10)
+    ]
+
+    # 5. Top 10 Losing Routes (impact: mean × count = sum of delays)
+    results["losing_routes"] = [
+        {"route": f"{o} → {d}", "impact": _num(t)}
+        for o, d, _, t in await _rollup(db, routes, airline, "total", 10)
+    ]
+
+    # 6. Vulnerability by Day of Week
+    results["vulnerable_days"] = results["delay_by_day"]
+
+    # 7. Scatter: Taxi-Out vs Arrival Delay needs raw rows, not summaries
+    results["taxiout_vs_delay"] = []
+
+    # 8. Hour of Day vs Avg Delay
+    results["hour_vs_delay"] = [
+        {"hour": int(h), "avg_arrival_delay": _num(m)}
+        for h, m, _ in await _rollup(db, hours, airline)
+    ]
+    return results
@@ -0,0 +1,96 @@
+"""
+Keyset-paginated reads of stored predictions (final_db_schema).
+
+Pages are ordered by PAGE_KEY, the table's primary key with the date first.
+The next page starts after the last row of the previous one (an opaque
+cursor holding its key), so every page is an index range scan, however
+deep. Each filter shape has an index that returns rows in page order:
+
+    airline (+ route)        ix_final_db_schema_airline_date
+    origin + destination     ix_final_db_schema_route
+    dates only / no filter   ix_final_db_schema_date
+
+Columns fixed by an equality filter are left out of the seek comparison,
+so it lines up with the index after its equality prefix. min_delay has no
+index: one on the delay could not return rows in page order, so it is a
+filter on the ordered scan, which reads on until the page is full (a very
+selective min_delay reads more of the index per page). Date bounds are
+also expressed on (YEAR, MONTH) so Postgres prunes the monthly partitions.
+"""
+import base64
+import datetime
+import json
+
+from sqlalchemy import and_, or_, select, tuple_
+
+from databases.models import final_db_schema
+
+T = final_db_schema.__table__
+PAGE_KEY = ("YEAR", "MONTH", "DAY", "AIRLINE", "FLIGHT_NUMBER", "ORIGIN_AIRPORT")
+
+
+def encode_cursor(row) -> str:
+    key = [row[c] for c in PAGE_KEY]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """PAGE_KEY values from a cursor; ValueError if it is malformed."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        y, m, d, airline, flight_number, origin = key
+        return dict(zip(PAGE_KEY, (int(y), int(m), int(d), str(airline), int(flight_number), str(origin))))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def months_from(year: int, month: int):
+    """(YEAR, MONTH) >= (year, month), in a form partition pruning understands."""
+    return or_(T.c.YEAR > year, and_(T.c.YEAR == year, T.c.MONTH >= month))
+
+
+def months_until(year: int, month: int):
+    return or_(T.c.YEAR < year, and_(T.c.YEAR == year, T.c.MONTH <= month))
+
+
+def predictions_query(
+    airline: str = None,
+    origin: str = None,
+    destination: str = None,
+    date_from: datetime.date = None,
+    date_to: datetime.date = None,
+    min_delay: float = None,
+    after: dict = None,
+    limit: int = 100,
+):
+    """SELECT for one page of predictions; `after` is a decoded cursor."""
+    fixed = {}
+    if airline is not None:
+        fixed["AIRLINE"] = airline
+    if origin is not None:
+        fixed["ORIGIN_AIRPORT"] = origin
+    where = [T.c[col] == value for col, value in fixed.items()]
+    if destination is not None:
+        where.append(T.c.DESTINATION_AIRPORT == destination)
+
+    date = tuple_(T.c.YEAR, T.c.MONTH, T.c.DAY)
+    if date_from is not None:
+        where += [months_from(date_from.year, date_from.month),
+                  date >= (date_from.year, date_from.month, date_from.day)]
+    if date_to is not None:
+        where += [months_until(date_to.year, date_to.month),
+                  date <= (date_to.year, date_to.month, date_to.day)]
+    if min_delay is not None:
+        where.append(T.c.ARRIVAL_DELAY_PREDICTED >= min_delay)
+
+    if after is not None:
+        seek = [c for c in PAGE_KEY if c not in fixed]
+        where += [months_from(after["YEAR"], after["MONTH"]),
+                  tuple_(*(T.c[c] for c in seek)) > tuple(after[c] for c in seek)]
+
+    return (
+        select(T)
+        .where(*where)
+        .order_by(*(T.c[c] for c in PAGE_KEY))
+        .limit(limit)
+    )
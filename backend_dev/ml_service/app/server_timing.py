@@ -0,0 +1,231 @@
+"""
+Per-request timing: Server-Timing headers and an opt-in sampling profiler.
+
+Every metrics.stage() (and span()) inside a request is recorded for that
+request and returned in its Server-Timing header, summed per name:
+
+    Server-Timing: csv_parse;dur=12.4, validation;dur=3.1, model_scoring;dur=20.7, app;dur=41.2
+
+Spans that finish after the response headers are sent (streamed bodies)
+are not included.
+
+A request is profiled when it carries PROFILE_HEADER (if configured) or is
+picked at PROFILE_SAMPLE_RATE. A sampler thread then records, every
+PROFILE_INTERVAL_MS, the stacks of the threads working for that request:
+the event loop, and every thread while it runs the request's work through
+run_in_threadpool(), a @profiled sync endpoint or profile_thread(). The
+event loop is shared, so other async requests can show up in its stacks;
+other requests' threadpool work does not. If the request took at least
+PROFILE_SLOW_MS the folded stacks are written to PROFILE_DIR, ready for
+flamegraph.pl or speedscope. Only one request is profiled at a time.
+"""
+import contextvars
+import functools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from starlette import concurrency
+
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "").lower().encode()
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+
+# Spans of the request being served: list of (name, seconds), or None
+_spans = contextvars.ContextVar("server_timing_spans", default=None)
+# StackSampler of the request being served, if it is profiled
+_profile = contextvars.ContextVar("server_timing_profile", default=None)
+
+
+def record_span(name: str, seconds: float):
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block as a Server-Timing entry only (no metric)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - t0)
+
+
+def header_value(spans: list, total: float) -> bytes:
+    durations = {}
+    for name, seconds in spans:
+        durations[name] = durations.get(name, 0.0) + seconds
+    durations["app"] = total
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in durations.items()).encode()
+
+
+# ------------------------------
+# Sampling profiler
+
+# Leaf frames in these modules are threads waiting for work, not busy
+IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+
+class StackSampler:
+    """
+    Samples, from a background thread, the stacks of the threads added with
+    add_thread(); the thread that creates it is added for good.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = Counter()
+        self._threads = Counter({threading.get_ident(): 1})
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def add_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] += 1
+
+    def remove_thread(self, ident: int):
+        with self._lock:
+            self._threads[ident] -= 1
+            if self._threads[ident] <= 0:
+                del self._threads[ident]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            frames = sys._current_frames()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is None or frame.f_code.co_filename.endswith(IDLE_MODULES):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def current_profile():
+    """The StackSampler of the request being served, or None."""
+    return _profile.get()
+
+
+@contextmanager
+def profile_thread(*samplers):
+    """
+    Add the calling thread to the profile of the current request (or to
+    `samplers`, e.g. captured in another context) while the block runs.
+    """
+    samplers = [s for s in (samplers or (_profile.get(),)) if s is not None]
+    ident = threading.get_ident()
+    for sampler in samplers:
+        sampler.add_thread(ident)
+    try:
+        yield
+    finally:
+        for sampler in samplers:
+            sampler.remove_thread(ident)
+
+
+async def run_in_threadpool(func, *args, **kwargs):
+    """starlette's run_in_threadpool, with the worker thread in the request's profile."""
+    sampler = _profile.get()
+    if sampler is None:
+        return await concurrency.run_in_threadpool(func, *args, **kwargs)
+
+    def run():
+        with profile_thread(sampler):
+            return func(*args, **kwargs)
+    return await concurrency.run_in_threadpool(run)
+
+
+def profiled(endpoint):
+    """Decorator for sync endpoints: their threadpool thread is in the request's profile."""
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        with profile_thread():
+            return endpoint(*args, **kwargs)
+    return wrapper
+
+
+_profiling = threading.Lock()
+
+
+def write_profile(samples: Counter, method: str, path: str, elapsed_ms: float) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-") or "root"
+    out = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{method}-{slug}-{elapsed_ms:.0f}ms.folded")
+    with open(out, "w") as f:
+        for stack, n in samples.most_common():
+            f.write(f"{stack} {n}\n")
+    return out
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware: Server-Timing header, and profiling when requested."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _should_profile(self, scope) -> bool:
+        if PROFILE_HEADER and any(k == PROFILE_HEADER for k, _ in scope["headers"]):
+            return True
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        spans = []
+        token = _spans.set(spans)
+        t0 = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                value = header_value(spans, time.perf_counter() - t0)
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", value)]}
+            await send(message)
+
+        sampler = None
+        if self._should_profile(scope) and _profiling.acquire(blocking=False):
+            sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+            sampler.start()
+        profile_token = _profile.set(sampler)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _profile.reset(profile_token)
+            _spans.reset(token)
+            if sampler is not None:
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                # Joining the sampler and writing the file block, so keep them off the event loop
+                try:
+                    samples = await concurrency.run_in_threadpool(sampler.stop)
+                finally:
+                    _profiling.release()
+                if samples and elapsed_ms >= PROFILE_SLOW_MS:
+                    out = await concurrency.run_in_threadpool(
+                        write_profile, samples, scope["method"], scope["path"], elapsed_ms
+                    )
+                    print(f"[INFO] Profile of {scope['method']} {scope['path']} ({elapsed_ms:.0f} ms) written to {out}")
@@ -0,0 +1,332 @@
+"""
+Pure NumPy scorer for the H2O XGBoost MOJO.
+
+Reads the booster out of the MOJO zip into flat node tables (feature index,
+threshold, left/right child, default direction, leaf value) and scores whole
+batches by walking every (row, tree) pair one level per step, without a JVM.
+
+Input encoding follows H2O's XGBoost MOJO scorer: categoricals are one-hot with
+an extra "missing(NA)" slot per column, and with a sparse model every non-hot
+slot and every numeric 0 is treated as missing.
+"""
+import configparser
+import struct
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from app import metrics
+
+# Cells PredictCsv treats as missing (see PredictCsv.formatDataRow)
+NA_CELLS = {"", "NA", "N/A", "-"}
+
+_NODE_DTYPE = np.dtype([
+    ("parent", "<i4"), ("left", "<i4"), ("right", "<i4"), ("sindex", "<u4"), ("value", "<f4"),
+])
+_LEARNER_PARAM_SIZE = 136
+_GBTREE_PARAM_SIZE = 160
+_TREE_PARAM_SIZE = 148
+_NODE_STAT_SIZE = 16
+
+# Rows scored per traversal block; bounds the (rows x trees) working set
+SCORE_BLOCK_ROWS = 4096
+
+
+def _read_string(buf: bytes, offset: int):
+    (length,) = struct.unpack_from("<Q", buf, offset)
+    start = offset + 8
+    return buf[start:start + length].decode(), start + length
+
+
+def parse_booster(buf: bytes) -> dict:
+    """
+    Parse a legacy binary ("binf") XGBoost gbtree model into flat node tables.
+    Child indices are global, i.e. already offset by the tree's first node.
+    """
+    if buf[:4] != b"binf":
+        raise ValueError("Unsupported booster format")
+    offset = 4
+    (base_score,) = struct.unpack_from("<f", buf, offset)
+    offset += _LEARNER_PARAM_SIZE
+
+    objective, offset = _read_string(buf, offset)
+    booster, offset = _read_string(buf, offset)
+    if booster != "gbtree":
+        raise ValueError(f"Unsupported booster: {booster}")
+    if objective not in ("reg:squarederror", "reg:linear"):
+        raise ValueError(f"Unsupported objective: {objective}")
+
+    (num_trees,) = struct.unpack_from("<i", buf, offset)
+    offset += _GBTREE_PARAM_SIZE
+
+    roots, tables = [], []
+    n_total = 0
+    for _ in range(num_trees):
+        _, num_nodes, _, _, _, size_leaf_vector = struct.unpack_from("<6i", buf, offset)
+        offset += _TREE_PARAM_SIZE
+        if size_leaf_vector:
+            raise ValueError("Leaf vectors are not supported")
+        nodes = np.frombuffer(buf, dtype=_NODE_DTYPE, count=num_nodes, offset=offset)
+        offset += _NODE_DTYPE.itemsize * num_nodes
+        offset += _NODE_STAT_SIZE * num_nodes
+        roots.append(n_total)
+        tables.append(nodes)
+        n_total += num_nodes
+
+    nodes = np.concatenate(tables)
+    tree_offsets = np.repeat(np.asarray(roots, dtype=np.int32), [len(t) for t in tables])
+    is_leaf = nodes["left"] == -1
+    left = np.where(is_leaf, 0, nodes["left"]) + tree_offsets
+    right = np.where(is_leaf, 0, nodes["right"]) + tree_offsets
+    node_ids = np.arange(n_total, dtype=np.int32)
+
+    return {
+        "base_score": np.float32(base_score),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "feature": (nodes["sindex"] & 0x7FFFFFFF).astype(np.int32),
+        "default_left": (nodes["sindex"] >> 31).astype(bool),
+        "threshold": nodes["value"].copy(),
+        # Leaves point at themselves so a finished walk just stays put
+        "left": np.where(is_leaf, node_ids, left).astype(np.int32),
+        "right": np.where(is_leaf, node_ids, right).astype(np.int32),
+        "is_leaf": is_leaf,
+        "leaf_value": np.where(is_leaf, nodes["value"], 0).astype(np.float32),
+        "max_depth": _max_depth(nodes, roots),
+    }
+
+
+def _max_depth(nodes, roots) -> int:
+    depth = 0
+    for root in roots:
+        stack = [(0, 0)]
+        while stack:
+            node, d = stack.pop()
+            left = nodes["left"][root + node]
+            if left == -1:
+                depth = max(depth, d)
+            else:
+                stack.append((left, d + 1))
+                stack.append((nodes["right"][root + node], d + 1))
+    return depth
+
+
+class XGBoostMojo:
+    """
+    In-process scorer for an H2O XGBoost regression MOJO.
+
+    predict(rows) takes the same column -> cell string mappings as the MOJO
+    scorer pool; predict_frame(df) scores a DataFrame column-wise.
+    """
+
+    def __init__(self, ini: configparser.ConfigParser, columns: list, domains: dict, booster: dict):
+        info = ini["info"]
+        if info.get("algo") != "xgboost" or info.get("category") != "Regression":
+            raise ValueError("Only XGBoost regression MOJOs are supported")
+
+        self.cats = int(info["cats"])
+        self.nums = int(info["nums"])
+        self.cat_offsets = np.asarray(
+            [int(x) for x in info["cat_offsets"].strip("[]").split(",")], dtype=np.int32
+        )
+        self.sparse = info.get("sparse") == "true"
+        self.use_all_factor_levels = info.get("use_all_factor_levels") == "true"
+        self.columns = columns[: self.cats + self.nums]
+        self.cat_columns = self.columns[: self.cats]
+        self.num_columns = self.columns[self.cats:]
+        self.domains = [domains[i] for i in range(self.cats)]
+        self._level_index = [{level: j for j, level in enumerate(d)} for d in self.domains]
+
+        n_cat_slots = int(self.cat_offsets[-1])
+        self.n_cat_slots = n_cat_slots
+        self.cat_map = np.repeat(
+            np.arange(self.cats, dtype=np.int32), np.diff(self.cat_offsets)
+        )
+        self.booster = booster
+        self._build_layout()
+
+    @classmethod
+    def load(cls, mojo_path: str) -> "XGBoostMojo":
+        with zipfile.ZipFile(mojo_path) as zf:
+            raw_ini = zf.read("model.ini").decode()
+            booster = parse_booster(zf.read("boosterBytes"))
+
+            # [columns] and [domains] are plain line lists, not key/value pairs
+            sections, current = {}, None
+            for line in raw_ini.splitlines():
+                line = line.strip()
+                if line.startswith("[") and line.endswith("]"):
+                    current = line[1:-1]
+                    sections[current] = []
+                elif line and current:
+                    sections[current].append(line)
+
+            ini = configparser.ConfigParser(interpolation=None)
+            ini.read_string("[info]\n" + "\n".join(sections["info"]))
+
+            domains = {}
+            for line in sections.get("domains", []):
+                col, rest = line.split(":", 1)
+                _, filename = rest.split()
+                values = zf.read(f"domains/{filename}").decode().splitlines()
+                domains[int(col)] = values
+
+        return cls(ini, sections["columns"], domains, booster)
+
+    # ------------------------------
+    # Input encoding
+
+    def _encode_cells(self, rows: list):
+        n = len(rows)
+        hot = np.empty((n, self.cats), dtype=np.int32)
+        nums = np.empty((n, self.nums), dtype=np.float64)
+        for c, col in enumerate(self.cat_columns):
+            index = self._level_index[c]
+            hot[:, c] = [
+                -1 if row.get(col) in NA_CELLS else index.get(row.get(col), -1) for row in rows
+            ]
+        for j, col in enumerate(self.num_columns):
+            for i, row in enumerate(rows):
+                cell = row.get(col)
+                nums[i, j] = np.nan if cell is None or cell in NA_CELLS else float(cell)
+        return hot, nums
+
+    def _encode_frame(self, df: pd.DataFrame):
+        n = len(df)
+        hot = np.full((n, self.cats), -1, dtype=np.int32)
+        nums = np.full((n, self.nums), np.nan, dtype=np.float64)
+        for c, col in enumerate(self.cat_columns):
+            if col in df.columns:
+                # -1 for unknown levels and missing cells
+                hot[:, c] = pd.Index(self.domains[c]).get_indexer(df[col])
+        for j, col in enumerate(self.num_columns):
+            if col in df.columns:
+                nums[:, j] = pd.to_numeric(df[col], errors="raise").to_numpy(dtype=np.float64, na_value=np.nan)
+        return hot, nums
+
+    def _to_slots(self, levels: np.ndarray) -> np.ndarray:
+        """Map per-column level indices (-1 = NA/unknown) to one-hot slot ids."""
+        starts = self.cat_offsets[:-1]
+        na_slot = self.cat_offsets[1:] - 1
+        if self.use_all_factor_levels:
+            slots = levels + starts
+        else:
+            slots = np.where(levels == 0, -1, levels - 1 + starts)
+        slots = np.where(levels < 0, na_slot, slots)
+        return np.minimum(slots, na_slot).astype(np.int32)
+
+    # ------------------------------
+    # Scoring
+
+    def _build_layout(self):
+        """
+        Re-lay every tree as a complete binary tree of depth max_depth so a walk
+        is pure index arithmetic (children of k are 2k+1 / 2k+2). Shallow leaves
+        are pushed down the left spine through pad nodes that read an
+        always-missing column and default left.
+
+        Split features are remapped to the columns of a compact per-batch
+        matrix holding only the features the trees actually use.
+        """
+        b = self.booster
+        used = np.unique(b["feature"][~b["is_leaf"]])
+        na_col = len(used)
+        used_index = {int(f): u for u, f in enumerate(used)}
+
+        depth = b["max_depth"]
+        n_internal = 2 ** depth - 1
+        n_trees = len(b["roots"])
+        col = np.full((n_trees, n_internal), na_col, dtype=np.int32)
+        threshold = np.zeros((n_trees, n_internal), dtype=np.float32)
+        default_left = np.ones((n_trees, n_internal), dtype=bool)
+        leaf = np.zeros((n_trees, n_internal + 1), dtype=np.float32)
+
+        for t, root in enumerate(b["roots"]):
+            stack = [(int(root), 0)]
+            while stack:
+                node, pos = stack.pop()
+                if b["is_leaf"][node]:
+                    while pos < n_internal:
+                        pos = 2 * pos + 1
+                    leaf[t, pos - n_internal] = b["leaf_value"][node]
+                else:
+                    col[t, pos] = used_index[int(b["feature"][node])]
+                    threshold[t, pos] = b["threshold"][node]
+                    default_left[t, pos] = b["default_left"][node]
+                    stack.append((int(b["left"][node]), 2 * pos + 1))
+                    stack.append((int(b["right"][node]), 2 * pos + 2))
+
+        is_num = used >= self.n_cat_slots
+        self._used_num = np.flatnonzero(is_num)
+        self._used_num_src = used[is_num] - self.n_cat_slots
+        self._used_cat = np.flatnonzero(~is_num)
+        self._used_cat_slot = used[~is_num]
+        self._used_cat_col = self.cat_map[used[~is_num]]
+        self._n_cols = na_col + 1
+        self._depth = depth
+        self._n_internal = n_internal
+        self._col = col.ravel()
+        self._threshold = threshold.ravel()
+        self._default_right = ~default_left.ravel()
+        self._leaf = leaf.ravel()
+
+    def _feature_matrix(self, slots: np.ndarray, values: np.ndarray) -> np.ndarray:
+        n = len(values)
+        not_hot = np.float32(np.nan if self.sparse else 0.0)
+        X = np.empty((n, self._n_cols), dtype=np.float32)
+        X[:, self._used_num] = values[:, self._used_num_src]
+        X[:, self._used_cat] = np.where(
+            slots[:, self._used_cat_col] == self._used_cat_slot, np.float32(1.0), not_hot
+        )
+        X[:, -1] = np.nan
+        return X
+
+    def _score_block(self, slots: np.ndarray, values: np.ndarray) -> np.ndarray:
+        n = len(values)
+        n_trees = len(self.booster["roots"])
+        X = self._feature_matrix(slots, values).ravel()
+        row_base = (np.arange(n, dtype=np.intp) * self._n_cols)[:, None]
+        tree_base = (np.arange(n_trees, dtype=np.intp) * self._n_internal)[None, :]
+
+        k = np.zeros((n, n_trees), dtype=np.intp)
+        for _ in range(self._depth):
+            node = tree_base + k
+            x = X[row_base + self._col[node]]
+            go_right = np.where(np.isnan(x), self._default_right[node], x >= self._threshold[node])
+            k = 2 * k + 1 + go_right
+
+        leaf_base = (np.arange(n_trees, dtype=np.intp) * (self._n_internal + 1))[None, :]
+        leaves = self._leaf[leaf_base + k - self._n_internal]
+
+        # Accumulate in float32 tree by tree starting from base_score, in the
+        # same order as the Java predictor, so results match bit for bit
+        total = np.full(n, self.booster["base_score"], dtype=np.float32)
+        for t in range(n_trees):
+            total += leaves[:, t]
+        return total
+
+    def _score(self, levels: np.ndarray, nums: np.ndarray) -> np.ndarray:
+        slots = self._to_slots(levels)
+        values = nums.astype(np.float32)
+        if self.sparse:
+            values[values == 0] = np.nan
+
+        out = np.empty(len(values), dtype=np.float32)
+        for start in range(0, len(values), SCORE_BLOCK_ROWS):
+            stop = start + SCORE_BLOCK_ROWS
+            out[start:stop] = self._score_block(slots[start:stop], values[start:stop])
+        return out
+
+    def predict(self, rows: list) -> list:
+        """Score rows given as column -> cell string mappings."""
+        with metrics.stage("input_encoding"):
+            hot, nums = self._encode_cells(rows)
+        with metrics.stage("model_scoring"):
+            return [float(p) for p in self._score(hot, nums)]
+
+    def predict_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Score every row of a DataFrame; returns float64 predictions."""
+        with metrics.stage("input_encoding"):
+            hot, nums = self._encode_frame(df)
+        with metrics.stage("model_scoring"):
+            return self._score(hot, nums).astype(np.float64)
@@ -0,0 +1,28 @@
+"""
+Build the pre-aggregated delay cube used by /display (ANALYTICS_BACKEND=cube).
+
+    python build_delay_cube.py --source dataset/flights.parquet --out app/delay_cube
+"""
+import argparse
+
+from app.analytics import ANALYTICS_PATH
+from app.delay_cube import DELAY_CUBE_DIR, write_cube
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the /display delay cube")
+    parser.add_argument("--source", default=ANALYTICS_PATH, help="Raw flights parquet")
+    parser.add_argument("--out", default=DELAY_CUBE_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    print(f"[INFO] Building delay cube from {args.source}...")
+    stats = write_cube(args.source, args.out)
+    print(
+        f"[INFO] {stats['source_rows']} rows ({stats['source_bytes']} bytes) -> "
+        f"{stats['cube_rows']} cube rows ({stats['cube_bytes']} bytes) "
+        f"in {stats['build_seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
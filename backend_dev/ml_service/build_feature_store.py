@@ -0,0 +1,25 @@
+"""
+Rebuild the historical average-delay feature store (app/feature_store.py).
+
+    python build_feature_store.py --source dataset/flights.parquet --out app/feature_store.npz
+"""
+import argparse
+
+from app.analytics import ANALYTICS_PATH
+from app.feature_store import FEATURE_STORE_PATH, write_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the average-delay feature store")
+    parser.add_argument("--source", default=ANALYTICS_PATH, help="Raw flights parquet")
+    parser.add_argument("--out", default=FEATURE_STORE_PATH, help="Output .npz file")
+    args = parser.parse_args()
+
+    print(f"[INFO] Building feature store from {args.source}...")
+    stats = write_store(args.source, args.out)
+    keys = ", ".join(f"{feature}={n}" for feature, n in stats["keys"].items())
+    print(f"[INFO] Stored {keys} ({stats['store_bytes']} bytes) in {stats['build_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
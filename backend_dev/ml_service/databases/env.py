@@ -26,12 +26,21 @@ from databases import models
 target_metadata = models.Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    """Leave the monthly final_db_schema partitions (and their indexes) to the database."""
+    table = obj.table.name if type_ == "index" else name
+    if type_ in ("table", "index") and reflected and table.startswith("final_db_schema_"):
+        return False
+    return True
+
+
 def do_run_migrations(connection: Connection):
     """Synchronous migration runner."""
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -55,6 +64,7 @@ def run_migrations_online():
                 connection=connection,
                 target_metadata=target_metadata,
                 compare_type=True,
+                include_object=include_object,
             )
             with context.begin_transaction():
                 context.run_migrations()
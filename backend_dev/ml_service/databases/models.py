@@ -1,11 +1,16 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
+    Numeric,
     VARCHAR,
     Date,
     DateTime,
     DECIMAL,
+    Float,
     ForeignKey,
+    Index,
+    PrimaryKeyConstraint,
     String
 )
 from sqlalchemy.orm import relationship, declarative_base
@@ -64,8 +69,21 @@ class Booking(Base):
 
 class final_db_schema(Base):
     __tablename__ = "final_db_schema"
+    # One row per flight and day; on Postgres range-partitioned by month
+    # (see migration 7c3e91d2a4f6)
+    __table_args__ = (
+        PrimaryKeyConstraint("AIRLINE", "FLIGHT_NUMBER", "YEAR", "MONTH", "DAY", "ORIGIN_AIRPORT"),
+        # Page-order indexes for /predictions (see app/predictions.py)
+        Index("ix_final_db_schema_airline_date", "AIRLINE", "YEAR", "MONTH", "DAY", "FLIGHT_NUMBER", "ORIGIN_AIRPORT"),
+        Index("ix_final_db_schema_date", "YEAR", "MONTH", "DAY", "AIRLINE", "FLIGHT_NUMBER", "ORIGIN_AIRPORT"),
+        Index(
+            "ix_final_db_schema_route",
+            "ORIGIN_AIRPORT", "DESTINATION_AIRPORT", "YEAR", "MONTH", "DAY", "AIRLINE", "FLIGHT_NUMBER",
+        ),
+        {"postgresql_partition_by": 'RANGE ("YEAR", "MONTH")'},
+    )
 
-    FLIGHT_NUMBER = Column(Integer, primary_key=True)
+    FLIGHT_NUMBER = Column(Integer, autoincrement=False)
     YEAR = Column(Integer, nullable=False)
     MONTH = Column(Integer, nullable=False)
     DAY = Column(Integer, nullable=False)
@@ -80,4 +98,81 @@ class final_db_schema(Base):
     SCHEDULED_TIME = Column(Integer)
     DISTANCE = Column(Integer)
     SCHEDULED_ARRIVAL = Column(Integer, nullable=False)
-    ARRIVAL_DELAY_PREDICTED = Column(DECIMAL(20,15), nullable=False)
\ No newline at end of file
+    ARRIVAL_DELAY_PREDICTED = Column(DECIMAL(20,15), nullable=False)
+
+
+# ------------------------------
+# Per-airline rollups of ARRIVAL_DELAY_PREDICTED, kept up to date by
+# /store-into-db (see app/prediction_summaries.py)
+
+class PredictionRouteSummary(Base):
+    __tablename__ = "prediction_route_summary"
+
+    AIRLINE = Column(VARCHAR(20), primary_key=True)
+    ORIGIN_AIRPORT = Column(VARCHAR(20), primary_key=True)
+    DESTINATION_AIRPORT = Column(VARCHAR(20), primary_key=True)
+    delay_sum = Column(Numeric, nullable=False)
+    delay_count = Column(BigInteger, nullable=False)
+
+
+class PredictionFlightSummary(Base):
+    __tablename__ = "prediction_flight_summary"
+
+    AIRLINE = Column(VARCHAR(20), primary_key=True)
+    FLIGHT_NUMBER = Column(Integer, primary_key=True, autoincrement=False)
+    delay_sum = Column(Numeric, nullable=False)
+    delay_count = Column(BigInteger, nullable=False)
+
+
+class PredictionDaySummary(Base):
+    __tablename__ = "prediction_day_summary"
+
+    AIRLINE = Column(VARCHAR(20), primary_key=True)
+    DAY_OF_WEEK = Column(Integer, primary_key=True, autoincrement=False)
+    delay_sum = Column(Numeric, nullable=False)
+    delay_count = Column(BigInteger, nullable=False)
+
+
+class PredictionHourSummary(Base):
+    __tablename__ = "prediction_hour_summary"
+
+    AIRLINE = Column(VARCHAR(20), primary_key=True)
+    DEP_HOUR = Column(Integer, primary_key=True, autoincrement=False)
+    delay_sum = Column(Numeric, nullable=False)
+    delay_count = Column(BigInteger, nullable=False)
+
+
+class PredictionAirportSummary(Base):
+    __tablename__ = "prediction_airport_summary"
+
+    AIRLINE = Column(VARCHAR(20), primary_key=True)
+    DESTINATION_AIRPORT = Column(VARCHAR(20), primary_key=True)
+    delay_sum = Column(Numeric, nullable=False)
+    delay_count = Column(BigInteger, nullable=False)
+
+
+class BatchJob(Base):
+    __tablename__ = "batch_jobs"
+    # CSV uploads scored in the background by job workers (see app/jobs.py)
+    __table_args__ = (
+        # Workers look for the oldest claimable job
+        Index("ix_batch_jobs_status_created", "status", "created_at"),
+    )
+
+    id = Column(VARCHAR(32), primary_key=True)
+    kind = Column(VARCHAR(20), nullable=False)  # predict-from-csv, store-into-db
+    status = Column(VARCHAR(20), nullable=False)  # queued, running, done, failed
+    filename = Column(String)
+    chunk_rows = Column(Integer, nullable=False)
+    total_rows = Column(Integer, nullable=False)
+    rows_done = Column(Integer, nullable=False, default=0)
+    chunks_done = Column(Integer, nullable=False, default=0)
+    result_bytes = Column(BigInteger, nullable=False, default=0)
+    processing_seconds = Column(Float, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker = Column(VARCHAR(100))
+    error = Column(String)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
@@ -0,0 +1,127 @@
+"""partition final_db_schema by month with a composite key
+
+Revision ID: 7c3e91d2a4f6
+Revises: 428342b4acbf
+Create Date: 2026-10-18 10:12:41.508114
+
+final_db_schema is rebuilt as a table range-partitioned on (YEAR, MONTH),
+one partition per month plus a default partition, keyed by
+(AIRLINE, FLIGHT_NUMBER, YEAR, MONTH, DAY, ORIGIN_AIRPORT) and indexed on
+(AIRLINE, YEAR, MONTH, DAY). Monthly partitions are created with
+final_db_schema_add_month(year, month), which the app calls before writing
+a month it has not seen; rows already in the default partition for that
+month are moved into the new partition.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91d2a4f6'
+down_revision: Union[str, Sequence[str], None] = '428342b4acbf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIMARY_KEY = ('AIRLINE', 'FLIGHT_NUMBER', 'YEAR', 'MONTH', 'DAY', 'ORIGIN_AIRPORT')
+COLUMNS = (
+    '"FLIGHT_NUMBER", "YEAR", "MONTH", "DAY", "DAY_OF_WEEK", "AIRLINE", "ORIGIN_AIRPORT", '
+    '"DESTINATION_AIRPORT", "SCHEDULED_DEPARTURE", "DEPARTURE_TIME", "DEPARTURE_DELAY", "TAXI_OUT", '
+    '"SCHEDULED_TIME", "DISTANCE", "SCHEDULED_ARRIVAL", "ARRIVAL_DELAY_PREDICTED"'
+)
+
+ADD_MONTH = """
+CREATE OR REPLACE FUNCTION final_db_schema_add_month(y integer, m integer) RETURNS void AS $$
+DECLARE
+    part text := format('final_db_schema_%s_%s', y, lpad(m::text, 2, '0'));
+    next_y integer := CASE WHEN m = 12 THEN y + 1 ELSE y END;
+    next_m integer := CASE WHEN m = 12 THEN 1 ELSE m + 1 END;
+BEGIN
+    -- Serialize concurrent writers adding the same month
+    PERFORM pg_advisory_xact_lock(hashtext('final_db_schema_partitions'));
+    IF to_regclass(part) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE final_db_schema INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM final_db_schema_default WHERE "YEAR" = %s AND "MONTH" = %s RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved', y, m, part
+    );
+    EXECUTE format(
+        'ALTER TABLE final_db_schema ATTACH PARTITION %I FOR VALUES FROM (%s, %s) TO (%s, %s)',
+        part, y, m, next_y, next_m
+    );
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+def final_db_schema_columns(autoincrement=False):
+    return [
+        sa.Column('FLIGHT_NUMBER', sa.Integer(), autoincrement=autoincrement, nullable=False),
+        sa.Column('YEAR', sa.Integer(), nullable=False),
+        sa.Column('MONTH', sa.Integer(), nullable=False),
+        sa.Column('DAY', sa.Integer(), nullable=False),
+        sa.Column('DAY_OF_WEEK', sa.Integer(), nullable=False),
+        sa.Column('AIRLINE', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('ORIGIN_AIRPORT', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('DESTINATION_AIRPORT', sa.VARCHAR(length=20), nullable=False),
+        sa.Column('SCHEDULED_DEPARTURE', sa.Integer(), nullable=False),
+        sa.Column('DEPARTURE_TIME', sa.Integer(), nullable=False),
+        sa.Column('DEPARTURE_DELAY', sa.Integer(), nullable=False),
+        sa.Column('TAXI_OUT', sa.Integer(), nullable=True),
+        sa.Column('SCHEDULED_TIME', sa.Integer(), nullable=True),
+        sa.Column('DISTANCE', sa.Integer(), nullable=True),
+        sa.Column('SCHEDULED_ARRIVAL', sa.Integer(), nullable=False),
+        sa.Column('ARRIVAL_DELAY_PREDICTED', sa.DECIMAL(precision=20, scale=15), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('final_db_schema', 'final_db_schema_unpartitioned')
+    op.execute('ALTER INDEX final_db_schema_pkey RENAME TO final_db_schema_unpartitioned_pkey')
+
+    op.create_table('final_db_schema',
+    *final_db_schema_columns(),
+    sa.PrimaryKeyConstraint(*PRIMARY_KEY, name='final_db_schema_pkey'),
+    postgresql_partition_by='RANGE ("YEAR", "MONTH")'
+    )
+    op.create_index('ix_final_db_schema_airline_date', 'final_db_schema', ['AIRLINE', 'YEAR', 'MONTH', 'DAY'])
+    op.execute('CREATE TABLE final_db_schema_default PARTITION OF final_db_schema DEFAULT')
+    op.execute(ADD_MONTH)
+
+    # One partition per month already stored, then move the rows across
+    op.execute(
+        'SELECT final_db_schema_add_month(y, m) FROM '
+        '(SELECT DISTINCT "YEAR" AS y, "MONTH" AS m FROM final_db_schema_unpartitioned '
+        'WHERE "MONTH" BETWEEN 1 AND 12) months'
+    )
+    op.execute(
+        f'INSERT INTO final_db_schema ({COLUMNS}) SELECT {COLUMNS} FROM final_db_schema_unpartitioned'
+    )
+    op.drop_table('final_db_schema_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('final_db_schema', 'final_db_schema_partitioned')
+    op.execute('ALTER INDEX final_db_schema_pkey RENAME TO final_db_schema_partitioned_pkey')
+
+    op.create_table('final_db_schema',
+    *final_db_schema_columns(autoincrement=True),
+    sa.PrimaryKeyConstraint('FLIGHT_NUMBER', name='final_db_schema_pkey')
+    )
+    # FLIGHT_NUMBER alone is the key again: keep one row per flight number
+    op.execute(
+        f'INSERT INTO final_db_schema ({COLUMNS}) '
+        f'SELECT DISTINCT ON ("FLIGHT_NUMBER") {COLUMNS} FROM final_db_schema_partitioned '
+        'ORDER BY "FLIGHT_NUMBER", "YEAR" DESC, "MONTH" DESC, "DAY" DESC'
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('final_db_schema', 'FLIGHT_NUMBER'), "
+        'COALESCE(MAX("FLIGHT_NUMBER"), 0) + 1, false) FROM final_db_schema'
+    )
+    op.drop_table('final_db_schema_partitioned')
+    op.execute('DROP FUNCTION IF EXISTS final_db_schema_add_month(integer, integer)')
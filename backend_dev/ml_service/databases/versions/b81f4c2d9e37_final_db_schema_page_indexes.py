@@ -0,0 +1,39 @@
+"""final_db_schema indexes for keyset-paginated reads
+
+Revision ID: b81f4c2d9e37
+Revises: 7c3e91d2a4f6
+Create Date: 2026-10-18 11:02:17.264930
+
+Each index returns rows in /predictions page order (date, airline, flight
+number, origin) after its equality prefix, so pages are index range scans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81f4c2d9e37'
+down_revision: Union[str, Sequence[str], None] = '7c3e91d2a4f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_final_db_schema_airline_date', table_name='final_db_schema')
+    op.create_index('ix_final_db_schema_airline_date', 'final_db_schema',
+                    ['AIRLINE', 'YEAR', 'MONTH', 'DAY', 'FLIGHT_NUMBER', 'ORIGIN_AIRPORT'])
+    op.create_index('ix_final_db_schema_date', 'final_db_schema',
+                    ['YEAR', 'MONTH', 'DAY', 'AIRLINE', 'FLIGHT_NUMBER', 'ORIGIN_AIRPORT'])
+    op.create_index('ix_final_db_schema_route', 'final_db_schema',
+                    ['ORIGIN_AIRPORT', 'DESTINATION_AIRPORT', 'YEAR', 'MONTH', 'DAY', 'AIRLINE', 'FLIGHT_NUMBER'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_final_db_schema_route', table_name='final_db_schema')
+    op.drop_index('ix_final_db_schema_date', table_name='final_db_schema')
+    op.drop_index('ix_final_db_schema_airline_date', table_name='final_db_schema')
+    op.create_index('ix_final_db_schema_airline_date', 'final_db_schema', ['AIRLINE', 'YEAR', 'MONTH', 'DAY'])
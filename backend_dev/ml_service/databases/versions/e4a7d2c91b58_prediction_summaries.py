@@ -0,0 +1,74 @@
+"""per-airline summary tables of predicted arrival delay
+
+Revision ID: e4a7d2c91b58
+Revises: b81f4c2d9e37
+Create Date: 2026-10-18 12:21:40.917352
+
+Sum and count of ARRIVAL_DELAY_PREDICTED per airline and route, flight,
+day of week, departure hour and destination airport. /store-into-db adds
+each chunk's deltas; they are backfilled here from final_db_schema, which
+is locked against writes meanwhile so no chunk is counted twice or missed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7d2c91b58'
+down_revision: Union[str, Sequence[str], None] = 'b81f4c2d9e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (key columns after AIRLINE, the same keys computed from final_db_schema)
+SUMMARIES = {
+    'prediction_route_summary': (
+        [sa.Column('ORIGIN_AIRPORT', sa.VARCHAR(length=20), nullable=False),
+         sa.Column('DESTINATION_AIRPORT', sa.VARCHAR(length=20), nullable=False)],
+        '"ORIGIN_AIRPORT", "DESTINATION_AIRPORT"',
+    ),
+    'prediction_flight_summary': (
+        [sa.Column('FLIGHT_NUMBER', sa.Integer(), autoincrement=False, nullable=False)],
+        '"FLIGHT_NUMBER"',
+    ),
+    'prediction_day_summary': (
+        [sa.Column('DAY_OF_WEEK', sa.Integer(), autoincrement=False, nullable=False)],
+        '"DAY_OF_WEEK"',
+    ),
+    'prediction_hour_summary': (
+        [sa.Column('DEP_HOUR', sa.Integer(), autoincrement=False, nullable=False)],
+        '"SCHEDULED_DEPARTURE" / 100',
+    ),
+    'prediction_airport_summary': (
+        [sa.Column('DESTINATION_AIRPORT', sa.VARCHAR(length=20), nullable=False)],
+        '"DESTINATION_AIRPORT"',
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (keys, _) in SUMMARIES.items():
+        op.create_table(table,
+        sa.Column('AIRLINE', sa.VARCHAR(length=20), nullable=False),
+        *keys,
+        sa.Column('delay_sum', sa.Numeric(), nullable=False),
+        sa.Column('delay_count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('AIRLINE', *(c.name for c in keys))
+        )
+
+    op.execute('LOCK TABLE final_db_schema IN SHARE MODE')
+    for table, (keys, source) in SUMMARIES.items():
+        columns = ', '.join(f'"{c.name}"' for c in keys)
+        op.execute(
+            f'INSERT INTO {table} ("AIRLINE", {columns}, delay_sum, delay_count) '
+            f'SELECT "AIRLINE", {source}, SUM("ARRIVAL_DELAY_PREDICTED"), COUNT(*) '
+            f'FROM final_db_schema GROUP BY "AIRLINE", {source}'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(list(SUMMARIES)):
+        op.drop_table(table)
@@ -0,0 +1,49 @@
+"""batch_jobs table for background CSV jobs
+
+Revision ID: f19b6e0c3a72
+Revises: e4a7d2c91b58
+Create Date: 2026-10-18 13:05:52.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19b6e0c3a72'
+down_revision: Union[str, Sequence[str], None] = 'e4a7d2c91b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('batch_jobs',
+    sa.Column('id', sa.VARCHAR(length=32), nullable=False),
+    sa.Column('kind', sa.VARCHAR(length=20), nullable=False),
+    sa.Column('status', sa.VARCHAR(length=20), nullable=False),
+    sa.Column('filename', sa.String(), nullable=True),
+    sa.Column('chunk_rows', sa.Integer(), nullable=False),
+    sa.Column('total_rows', sa.Integer(), nullable=False),
+    sa.Column('rows_done', sa.Integer(), nullable=False),
+    sa.Column('chunks_done', sa.Integer(), nullable=False),
+    sa.Column('result_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('processing_seconds', sa.Float(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('worker', sa.VARCHAR(length=100), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_batch_jobs_status_created', 'batch_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_batch_jobs_status_created', table_name='batch_jobs')
+    op.drop_table('batch_jobs')
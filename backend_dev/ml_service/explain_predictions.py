@@ -0,0 +1,152 @@
+"""
+EXPLAIN timings for the /predictions keyset queries on a real database.
+
+For every filter combination the endpoint supports, explains the first page
+and a deep page (a cursor near the end of the result). With sequential scans
+and sorts disabled, the plan must read final_db_schema only through the page
+indexes, and the first page must use the one that supports the filter. That
+proves the index returns rows in page order; past a cursor Postgres may pick
+the date index instead, since the seek itself narrows it to a few rows.
+On a small dev table the planner may prefer a seq scan and sort, so the
+default plan is only timed (EXPLAIN ANALYZE), to compare first and deep
+pages. Exits non-zero if any check fails. The first-page checks also run
+in CI on seeded data (tests/test_explain_predictions.py).
+
+    DATABASE_URL=postgresql+asyncpg://... python explain_predictions.py
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.predictions import PAGE_KEY, T, predictions_query
+
+DATE, AIRLINE, ROUTE = "ix_final_db_schema_date", "ix_final_db_schema_airline_date", "ix_final_db_schema_route"
+PAGE_INDEXES = {DATE, AIRLINE, ROUTE}
+
+# (name, filters, supporting indexes: the plan must use one of them)
+CASES = [
+    ("no filter", {}, {DATE}),
+    ("dates", {"date_from": "from", "date_to": "to"}, {DATE}),
+    ("airline", {"airline": "airline"}, {AIRLINE}),
+    ("airline + dates", {"airline": "airline", "date_from": "from", "date_to": "to"}, {AIRLINE}),
+    ("airline + min_delay", {"airline": "airline", "min_delay": "min_delay"}, {AIRLINE}),
+    ("airline + route", {"airline": "airline", "origin": "origin", "destination": "destination"}, {AIRLINE, ROUTE}),
+    ("route", {"origin": "origin", "destination": "destination"}, {ROUTE}),
+    ("route + dates", {"origin": "origin", "destination": "destination", "date_from": "from", "date_to": "to"},
+     {ROUTE}),
+    ("dates + min_delay", {"date_from": "from", "date_to": "to", "min_delay": "min_delay"}, {DATE}),
+]
+
+
+def sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+async def explain(conn, statement: str) -> dict:
+    plan = (await conn.execute(text(statement))).scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def sample_values(conn) -> dict:
+    """Filter values that match data: the rarest airline, the busiest route, the full date range."""
+    airline = (await conn.execute(
+        select(T.c.AIRLINE).group_by(T.c.AIRLINE).order_by(func.count()).limit(1)
+    )).scalar()
+    origin, destination = (await conn.execute(
+        select(T.c.ORIGIN_AIRPORT, T.c.DESTINATION_AIRPORT)
+        .group_by(T.c.ORIGIN_AIRPORT, T.c.DESTINATION_AIRPORT).order_by(func.count().desc()).limit(1)
+    )).one()
+    first, last = (await conn.execute(select(func.min(T.c.YEAR * 100 + T.c.MONTH), func.max(T.c.YEAR * 100 + T.c.MONTH)))).one()
+    return {
+        "airline": airline, "origin": origin, "destination": destination,
+        "from": datetime.date(first // 100, first % 100, 1),
+        "to": datetime.date(last // 100, last % 100, 28),
+        "min_delay": 10.0,
+    }
+
+
+async def plan_problems(conn, query: str, supporting: set = None, filtered: str = None) -> list:
+    """
+    What is wrong with the plan of `query` with sequential scans and sorts
+    disabled: Sort or Seq Scan nodes, indexes other than the page indexes,
+    when `supporting` is given no scan on any of those indexes, and when
+    `filtered` is given no index scan that filters on that column.
+    """
+    async with conn.begin_nested():
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        await conn.execute(text("SET LOCAL enable_sort = off"))
+        await conn.execute(text("SET LOCAL enable_incremental_sort = off"))
+        plan = await explain(conn, "EXPLAIN (FORMAT JSON) " + query)
+    nodes = list(plan_nodes(plan["Plan"]))
+    problems = [n["Node Type"] for n in nodes if n["Node Type"] in ("Sort", "Incremental Sort", "Seq Scan")]
+    used = set()
+    for n in nodes:
+        if "Index Name" in n:
+            used.add((await conn.execute(
+                text("SELECT inhparent::regclass::text FROM pg_inherits WHERE inhrelid = CAST(:i AS regclass)"),
+                {"i": f'"{n["Index Name"]}"'},
+            )).scalar() or n["Index Name"])
+    problems += [f"index {i}" for i in used - PAGE_INDEXES]
+    if supporting and not used & supporting:
+        problems.append(f"no scan on {' or '.join(sorted(supporting))}")
+    if filtered and not any("Index Name" in n and filtered in n.get("Filter", "") for n in nodes):
+        problems.append(f"{filtered} not filtered on the index scan")
+    return sorted(set(problems))
+
+
+async def check(conn, name: str, filters: dict, supporting: set, limit: int) -> bool:
+    """Explain the first page and a deep page; True when both pass."""
+    total = len((await conn.execute(predictions_query(**filters, limit=10**9).with_only_columns(T.c.YEAR))).all())
+    pages = [("first page", None)]
+    if total > limit:
+        deep = (await conn.execute(
+            predictions_query(**filters, limit=1).offset(int(total * 0.9))
+        )).mappings().first()
+        pages.append((f"row {int(total * 0.9)}", {c: deep[c] for c in PAGE_KEY}))
+
+    ok = True
+    for label, after in pages:
+        query = sql(predictions_query(**filters, after=after, limit=limit))
+        default = await explain(conn, "EXPLAIN (ANALYZE, FORMAT JSON) " + query)
+        filtered = "ARRIVAL_DELAY_PREDICTED" if "min_delay" in filters else None
+        problems = await plan_problems(conn, query, supporting if after is None else None, filtered)
+        passed = not problems
+        ok &= passed
+        print(f"[{'OK' if passed else 'FAIL'}] {name:22s} {label:12s} {default['Execution Time']:8.3f} ms"
+              + (f"  unexpected: {', '.join(problems)}" if problems else ""))
+    return ok
+
+
+async def main(url: str, limit: int):
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        values = await sample_values(conn)
+        print(f"[INFO] {await conn.scalar(select(func.count()).select_from(T))} rows; filter values: {values}")
+        ok = True
+        for name, filters, supporting in CASES:
+            ok &= await check(conn, name, {k: values[v] for k, v in filters.items()}, supporting, limit)
+    await engine.dispose()
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("DATABASE_URL or --database-url is required")
+    sys.exit(0 if asyncio.run(main(args.database_url, args.limit)) else 1)
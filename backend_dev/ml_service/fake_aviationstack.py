@@ -0,0 +1,200 @@
+"""
+Local stand-in for the AviationStack /v1/flights API.
+
+Lets the flight-ingestion paths be tested and load-tested with no network.
+
+Serves recorded responses (--recorded, a JSON file with a "data" list or a
+plain list of flight records) or deterministic synthetic flights, with
+configurable latency, error rate, not-found rate and rate limiting.
+
+    python fake_aviationstack.py --port 8100 --latency-ms 80 --jitter-ms 20
+    AVIATIONSTACK_BASE_URL=http://127.0.0.1:8100/v1/flights AVIATIONSTACK_API_KEY=test \
+        uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+AIRLINES = [
+    ("American Airlines", "AA", "AAL"), ("Delta Air Lines", "DL", "DAL"),
+    ("United Airlines", "UA", "UAL"), ("Southwest Airlines", "WN", "SWA"),
+    ("JetBlue Airways", "B6", "JBU"), ("Alaska Airlines", "AS", "ASA"),
+]
+AIRPORTS = [
+    ("Hartsfield-Jackson Atlanta International", "ATL"), ("Chicago O'Hare International", "ORD"),
+    ("Dallas/Fort Worth International", "DFW"), ("Denver International", "DEN"),
+    ("Los Angeles International", "LAX"), ("San Francisco International", "SFO"),
+    ("Seattle-Tacoma International", "SEA"), ("John F Kennedy International", "JFK"),
+]
+STATUSES = ["scheduled", "active", "landed", "cancelled", "diverted"]
+
+
+class TokenBucket:
+    """Allow `rate` requests per second with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def synthetic_flight(flight_number: str) -> dict:
+    """A stable, plausible flight record for a flight number."""
+    rng = random.Random(zlib.crc32(flight_number.encode()))
+    name, iata, icao = rng.choice(AIRLINES)
+    number = "".join(ch for ch in flight_number if ch.isdigit()) or str(rng.randint(1, 9999))
+    (dep_name, dep_code), (arr_name, arr_code) = rng.sample(AIRPORTS, 2)
+    scheduled = datetime.combine(date.today(), datetime.min.time()) + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+    delay = rng.choice([None, None, rng.randint(1, 180)])
+    arrival = scheduled + timedelta(minutes=rng.randint(60, 360))
+    return {
+        "flight_date": scheduled.date().isoformat(),
+        "flight_status": rng.choice(STATUSES),
+        "departure": {
+            "airport": dep_name, "timezone": None, "iata": dep_code, "icao": None,
+            "terminal": str(rng.randint(1, 5)), "gate": None, "delay": delay,
+            "scheduled": scheduled.isoformat() + "+00:00", "estimated": scheduled.isoformat() + "+00:00",
+            "actual": None, "estimated_runway": None, "actual_runway": None,
+        },
+        "arrival": {
+            "airport": arr_name, "timezone": None, "iata": arr_code, "icao": None,
+            "terminal": None, "gate": None, "baggage": None, "delay": delay,
+            "scheduled": arrival.isoformat() + "+00:00", "estimated": None,
+            "actual": None, "estimated_runway": None, "actual_runway": None,
+        },
+        "airline": {"name": name, "iata": iata, "icao": icao},
+        "flight": {"number": number, "iata": f"{iata}{number}", "icao": f"{icao}{number}", "codeshared": None},
+        "aircraft": None,
+        "live": None,
+    }
+
+
+def load_recorded(path: str) -> dict:
+    """flight number / IATA code -> recorded records."""
+    with open(path) as f:
+        payload = json.load(f)
+    records = payload.get("data", []) if isinstance(payload, dict) else payload
+    index = {}
+    for record in records:
+        flight = record.get("flight") or {}
+        for key in (flight.get("number"), flight.get("iata")):
+            if key:
+                index.setdefault(str(key).upper(), []).append(record)
+    return index
+
+
+def error(status: int, code: str, message: str) -> JSONResponse:
+    return JSONResponse(status_code=status, content={"error": {"code": code, "message": message}})
+
+
+def create_app(
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    not_found_rate: float = 0.0,
+    rate_limit: float = 0.0,
+    burst: int = 10,
+    recorded: dict = None,
+    seed: int = 42,
+) -> FastAPI:
+    app = FastAPI(title="Fake AviationStack")
+    rng = random.Random(seed)
+    bucket = TokenBucket(rate_limit, burst) if rate_limit > 0 else None
+    stats = {"requests": 0, "served": 0, "errors": 0, "not_found": 0, "rate_limited": 0}
+
+    @app.get("/v1/flights")
+    async def flights(
+        access_key: str = Query(None),
+        flight_number: str = Query(None),
+        flight_iata: str = Query(None),
+        limit: int = Query(100),
+    ):
+        stats["requests"] += 1
+        if not access_key:
+            return error(401, "missing_access_key", "You have not supplied an API Access Key.")
+        if bucket is not None and not bucket.take():
+            stats["rate_limited"] += 1
+            return error(429, "rate_limit_reached", "You have exceeded the maximum rate limitation allowed.")
+
+        delay = max(0.0, rng.gauss(latency_ms, jitter_ms)) if jitter_ms else latency_ms
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            return error(500, "internal_error", "An internal error occurred.")
+
+        key = (flight_number or flight_iata or "").strip().upper()
+        if recorded is not None:
+            data = recorded.get(key, [])
+        elif key and rng.random() >= not_found_rate:
+            data = [synthetic_flight(key)]
+        else:
+            data = []
+        data = data[:limit]
+        stats["served"] += 1
+        if not data:
+            stats["not_found"] += 1
+        return {
+            "pagination": {"limit": limit, "offset": 0, "count": len(data), "total": len(data)},
+            "data": data,
+        }
+
+    @app.get("/stats")
+    def fake_stats():
+        return stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Latency standard deviation")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 replies")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="Fraction of empty results")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second allowed (0: unlimited)")
+    parser.add_argument("--burst", type=int, default=10, help="Rate limiter burst size")
+    parser.add_argument("--recorded", help="JSON file of recorded flight records to serve")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        not_found_rate=args.not_found_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        recorded=load_recorded(args.recorded) if args.recorded else None,
+        seed=args.seed,
+    )
+    print(f"[INFO] Fake AviationStack on http://{args.host}:{args.port}/v1/flights")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Equivalence check and benchmark: vectorized feature engineering
+(app.features.engineer_features) vs the original row-wise implementation.
+
+Builds a synthetic raw flights frame, including missing times, overnight
+departures and NaN delays, runs both and fails if any feature differs.
+
+    python features_parity.py --rows 200000
+
+tests/test_features.py runs the same equality check on small fixed samples.
+"""
+import argparse
+import sys
+import time
+
+import holidays
+import numpy as np
+import pandas as pd
+
+from app.features import engineer_features
+
+AIRPORTS = ["ATL", "ORD", "DFW", "DEN", "LAX", "SFO", "SEA", "JFK", "BOS", "MIA", "HNL", "ANC"]
+AIRLINES = ["AA", "DL", "UA", "WN", "B6", "AS", "NK", "HA"]
+
+
+def legacy_features(df: pd.DataFrame) -> pd.DataFrame:
+    """The original preprocess_to_h2o feature steps, row by row."""
+    df["date"] = pd.to_datetime(df[["YEAR", "MONTH", "DAY"]])
+    us_holidays = holidays.country_holidays('US')
+    df["is_holiday"] = df["date"].apply(lambda x: 1 if x in us_holidays else 0)
+    df = df.drop(columns=["date"])
+
+    df["DEP_HOUR"] = df["SCHEDULED_DEPARTURE"] // 100
+    df["is_redeye"] = df["DEP_HOUR"].apply(lambda x: 1 if (x >= 22 or x < 6) else 0)
+
+    def time_diff(sched, actual):
+        try:
+            sched_h, sched_m = divmod(int(sched), 100)
+            actual_h, actual_m = divmod(int(actual), 100)
+            sched_total = sched_h * 60 + sched_m
+            actual_total = actual_h * 60 + actual_m
+            if actual_total < sched_total:  # overnight
+                actual_total += 24 * 60
+            return actual_total - sched_total
+        except:
+            return np.nan
+
+    df["DEP_TIME_DIFF"] = df.apply(
+        lambda row: time_diff(row["SCHEDULED_DEPARTURE"], row["DEPARTURE_TIME"]), axis=1
+    )
+
+    df["ROUTE"] = df["ORIGIN_AIRPORT"] + "_" + df["DESTINATION_AIRPORT"]
+    route_delay = df.groupby("ROUTE")["ARRIVAL_DELAY"].mean().rename("ROUTE_AVG_ARR_DELAY")
+    df = df.merge(route_delay, on="ROUTE", how="left")
+    airline_delay = df.groupby("AIRLINE")["ARRIVAL_DELAY"].mean().rename("AIRLINE_AVG_ARR_DELAY")
+    df = df.merge(airline_delay, on="AIRLINE", how="left")
+    flight_delay = df.groupby("FLIGHT_NUMBER")["ARRIVAL_DELAY"].mean().rename("FLIGHT_AVG_ARR_DELAY")
+    df = df.merge(flight_delay, on="FLIGHT_NUMBER", how="left")
+
+    df["is_weekend"] = df["DAY_OF_WEEK"].apply(lambda x: 1 if x in [6, 7] else 0)
+
+    bins = [0, 500, 1500, 3000, np.inf]
+    labels = ["short", "medium", "long", "ultra"]
+    df["DISTANCE_BUCKET"] = pd.cut(df["DISTANCE"], bins=bins, labels=labels)
+
+    return df.drop(columns=["YEAR", "DEP_HOUR", "ROUTE"])
+
+
+def synthetic_frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2014-12-01") + pd.to_timedelta(rng.integers(0, 800, n), unit="D")
+
+    def clock(size):
+        return rng.integers(0, 24, size) * 100 + rng.integers(0, 60, size)
+
+    sched = clock(n).astype(np.float64)
+    # Mostly small delays, some early departures, some past midnight
+    actual_min = (sched // 100) * 60 + sched % 100 + rng.integers(-20, 240, n)
+    actual_min %= 24 * 60
+    actual = (actual_min // 60) * 100 + actual_min % 60
+    actual[rng.random(n) < 0.05] = np.nan
+    sched[rng.random(n) < 0.01] = np.nan
+
+    delay = rng.normal(5, 30, n).round()
+    delay[rng.random(n) < 0.03] = np.nan
+
+    return pd.DataFrame({
+        "YEAR": dates.year,
+        "MONTH": dates.month,
+        "DAY": dates.day,
+        "DAY_OF_WEEK": dates.dayofweek + 1,
+        "AIRLINE": rng.choice(AIRLINES, n),
+        "FLIGHT_NUMBER": rng.integers(1, 3000, n),
+        "ORIGIN_AIRPORT": rng.choice(AIRPORTS, n),
+        "DESTINATION_AIRPORT": rng.choice(AIRPORTS, n),
+        "SCHEDULED_DEPARTURE": sched,
+        "DEPARTURE_TIME": actual,
+        "DISTANCE": rng.integers(30, 5000, n),
+        "ARRIVAL_DELAY": delay,
+    })
+
+
+def timed(fn, df):
+    t0 = time.perf_counter()
+    out = fn(df.copy())
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows, args.seed)
+    expected, t_legacy = timed(legacy_features, df)
+    actual, t_vector = timed(engineer_features, df)
+
+    print(f"[INFO] {args.rows} rows: row-wise {t_legacy:.3f}s, vectorized {t_vector:.3f}s "
+          f"({t_legacy / t_vector:.1f}x)")
+    try:
+        pd.testing.assert_frame_equal(actual, expected)
+    except AssertionError as e:
+        print("[WARN] Feature mismatch:", e)
+        sys.exit(1)
+    print("[INFO] All engineered features match")
+
+
+if __name__ == "__main__":
+    main()
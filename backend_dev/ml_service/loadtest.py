@@ -0,0 +1,324 @@
+"""
+Load-test benchmark for the ML service endpoints.
+
+Starts the app (in-process over ASGI, or as a uvicorn subprocess) against a
+throwaway SQLite database or a local Postgres, drives /predict-mojo,
+/predict-from-csv, /store-into-db and /display with an async load generator,
+and writes p50/p95/p99 latency, throughput and RSS per scenario as JSON.
+
+    python loadtest.py --mode uvicorn --concurrency 32 --out before.json
+    python loadtest.py --mode uvicorn --concurrency 32 --out after.json --compare before.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS = ["predict-mojo", "predict-from-csv", "store-into-db", "display"]
+
+AIRLINES = ["AA", "DL", "UA", "WN", "B6", "AS", "NK", "HA", "OO", "EV"]
+AIRPORTS = ["ATL", "ORD", "DFW", "DEN", "LAX", "SFO", "SEA", "JFK", "BOS", "MIA", "PHX", "LAS"]
+
+
+# ------------------------------
+# Synthetic payloads
+
+def flight_row(rng: random.Random, flight_number: int = None) -> dict:
+    sched = rng.randint(0, 23) * 100 + rng.randrange(0, 60, 5)
+    delay = rng.randint(-15, 120)
+    return {
+        "YEAR": 2015, "MONTH": rng.randint(1, 12), "DAY": rng.randint(1, 28),
+        "DAY_OF_WEEK": rng.randint(1, 7), "AIRLINE": rng.choice(AIRLINES),
+        "FLIGHT_NUMBER": flight_number if flight_number is not None else rng.randint(1, 7000),
+        "ORIGIN_AIRPORT": rng.choice(AIRPORTS), "DESTINATION_AIRPORT": rng.choice(AIRPORTS),
+        "SCHEDULED_DEPARTURE": sched, "DEPARTURE_TIME": (sched + delay) % 2400,
+        "DEPARTURE_DELAY": delay, "TAXI_OUT": rng.randint(5, 45),
+        "SCHEDULED_TIME": rng.randint(45, 400), "DISTANCE": rng.randint(80, 2800),
+        "SCHEDULED_ARRIVAL": rng.randint(0, 2359),
+    }
+
+
+def csv_payload(rows: list) -> bytes:
+    out = io.StringIO()
+    columns = list(rows[0])
+    out.write(",".join(columns) + "\n")
+    for row in rows:
+        out.write(",".join(str(row[c]) for c in columns) + "\n")
+    return out.getvalue().encode()
+
+
+# ------------------------------
+# Measurement
+
+def rss_bytes(pid: int) -> int:
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    return 0
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return None
+    i = min(len(sorted_values) - 1, max(0, round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+def summarize(latencies: list, errors: int, elapsed: float, rows_per_request: int, rss: list) -> dict:
+    ms = sorted(x * 1000 for x in latencies)
+    n = len(ms)
+    return {
+        "requests": n,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(n / elapsed, 2) if elapsed else None,
+        "rows_per_s": round(n * rows_per_request / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(sum(ms) / n, 3) if n else None,
+            "p50": round(percentile(ms, 50), 3) if n else None,
+            "p95": round(percentile(ms, 95), 3) if n else None,
+            "p99": round(percentile(ms, 99), 3) if n else None,
+            "max": round(ms[-1], 3) if n else None,
+        },
+        "rss_mb": {
+            "start": round(rss[0] / 2**20, 1) if rss else None,
+            "peak": round(max(rss) / 2**20, 1) if rss else None,
+            "end": round(rss[-1] / 2**20, 1) if rss else None,
+        },
+    }
+
+
+async def drive(client: httpx.AsyncClient, make_request, total: int, concurrency: int, pid: int):
+    """Run `total` requests with at most `concurrency` in flight, sampling RSS."""
+    latencies, errors = [], 0
+    rss = [rss_bytes(pid)]
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < total:
+            i = next_index
+            next_index += 1
+            t0 = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                ok = response.status_code < 400 and not (
+                    response.headers.get("content-type", "").startswith("application/json")
+                    and isinstance(response.json(), dict) and "error" in response.json()
+                )
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - t0)
+            errors += not ok
+
+    async def sample():
+        while True:
+            await asyncio.sleep(0.05)
+            rss.append(rss_bytes(pid))
+
+    sampler = asyncio.create_task(sample())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    sampler.cancel()
+    rss.append(rss_bytes(pid))
+    return latencies, errors, elapsed, rss
+
+
+def scenario_requests(name: str, args, rng: random.Random):
+    """(make_request(client, i), rows per request) for a scenario."""
+    if name == "predict-mojo":
+        # A pool of distinct payloads controls how often the prediction cache hits
+        pool = [flight_row(rng) for _ in range(args.distinct)]
+        return (lambda c, i: c.post("/predict-mojo", json=pool[i % len(pool)])), 1
+
+    if name == "predict-from-csv":
+        body = csv_payload([flight_row(rng) for _ in range(args.csv_rows)])
+        return (lambda c, i: c.post(
+            "/predict-from-csv", files={"file": ("flights.csv", body, "text/csv")}
+        )), args.csv_rows
+
+    if name == "store-into-db":
+        # Fresh flight numbers keep every row's final_db_schema key unique
+        base = args.flight_number_base
+
+        def store(c, i):
+            rows = [flight_row(rng, base + i * args.csv_rows + j) for j in range(args.csv_rows)]
+            return c.post("/store-into-db", files={"file": ("flights.csv", csv_payload(rows), "text/csv")})
+        return store, args.csv_rows
+
+    if name == "display":
+        return (lambda c, i: c.get("/display", params={"airline": AIRLINES[i % len(AIRLINES)]})), 1
+
+    raise ValueError(name)
+
+
+# ------------------------------
+# App under test
+
+def app_env(args) -> dict:
+    env = {**os.environ, "PYTHONPATH": BASE_DIR, "DATABASE_URL": args.db_url}
+    if args.analytics_path:
+        env["ANALYTICS_PATH"] = args.analytics_path
+        env["ANALYTICS_WARMUP"] = "startup"
+    return env
+
+
+async def init_sqlite(url: str):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from databases.models import Base
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+async def run_inprocess(args, scenarios):
+    os.environ.update(app_env(args))
+    sys.path.insert(0, BASE_DIR)
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            return await run_scenarios(client, args, scenarios, os.getpid())
+
+
+async def run_uvicorn(args, scenarios):
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+           "--log-level", "warning", "--workers", "1"]
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, env=app_env(args),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{args.port}"
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            deadline = time.monotonic() + 60
+            while True:
+                try:
+                    await client.get("/")
+                    break
+                except httpx.HTTPError:
+                    if proc.poll() is not None or time.monotonic() > deadline:
+                        raise RuntimeError("uvicorn did not start")
+                    await asyncio.sleep(0.2)
+            return await run_scenarios(client, args, scenarios, proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+async def run_scenarios(client, args, scenarios, pid: int) -> dict:
+    results = {}
+    for name in scenarios:
+        rng = random.Random(args.seed)
+        make_request, rows = scenario_requests(name, args, rng)
+        total = args.requests if rows == 1 else args.batch_requests
+        if args.warmup:
+            await drive(client, make_request, min(args.warmup, total), args.concurrency, pid)
+        latencies, errors, elapsed, rss = await drive(client, make_request, total, args.concurrency, pid)
+        results[name] = summarize(latencies, errors, elapsed, rows, rss)
+        r = results[name]
+        print(f"[INFO] {name:17s} {r['throughput_rps']:>9} req/s  p50 {r['latency_ms']['p50']:.2f} ms  "
+              f"p95 {r['latency_ms']['p95']:.2f} ms  p99 {r['latency_ms']['p99']:.2f} ms  "
+              f"errors {errors}  peak RSS {r['rss_mb']['peak']} MB")
+    return results
+
+
+def compare(results: dict, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["scenarios"]
+    print(f"[INFO] Compared with {baseline_path}:")
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b:
+            continue
+        for label, new, old in [
+            ("throughput", r["throughput_rps"], b["throughput_rps"]),
+            ("p50", r["latency_ms"]["p50"], b["latency_ms"]["p50"]),
+            ("p99", r["latency_ms"]["p99"], b["latency_ms"]["p99"]),
+        ]:
+            if new is not None and old:
+                print(f"  {name:17s} {label:10s} {old:>10.2f} -> {new:>10.2f}  ({(new - old) / old:+.1%})")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="uvicorn")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per single-row scenario")
+    parser.add_argument("--batch-requests", type=int, default=20, help="Requests per CSV scenario")
+    parser.add_argument("--csv-rows", type=int, default=1000, help="Rows per uploaded CSV")
+    parser.add_argument("--distinct", type=int, default=500, help="Distinct /predict-mojo payloads")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--db-url", help="Database URL (default: a throwaway SQLite file)")
+    parser.add_argument("--flight-number-base", type=int, default=None,
+                        help="First FLIGHT_NUMBER written by store-into-db")
+    parser.add_argument("--analytics-path", help="Parquet for /display (default: ANALYTICS_PATH)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="loadtest_results.json")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    tmp = None
+    if args.db_url is None:
+        tmp = tempfile.TemporaryDirectory()
+        args.db_url = f"sqlite+aiosqlite:///{os.path.join(tmp.name, 'loadtest.db')}"
+        sys.path.insert(0, BASE_DIR)
+        asyncio.run(init_sqlite(args.db_url))
+    if args.flight_number_base is None:
+        # Fresh keys per run, so repeated runs against Postgres do not collide
+        args.flight_number_base = random.randrange(1, 2**31 - 10**7, 10**6)
+
+    runner = run_inprocess if args.mode == "inprocess" else run_uvicorn
+    results = asyncio.run(runner(args, scenarios))
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "env": {k: os.environ[k] for k in sorted(os.environ) if k.startswith(
+            ("MOJO_", "ANALYTICS_", "PREDICT", "CSV_", "STORE_", "FEATURE_")
+        )},
+        "scenarios": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] Results written to {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
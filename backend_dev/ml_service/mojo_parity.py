@@ -0,0 +1,131 @@
+"""
+Parity check: NumPy MOJO scorer (app.xgb_mojo) vs hex.genmodel.tools.PredictCsv.
+
+Scores the same rows with both and fails if any prediction differs. Rows come
+from --input (a CSV with model columns) or are sampled synthetically from the
+MOJO's own domains, including unknown levels, missing cells and zeros.
+
+    python mojo_parity.py --jar model/h2o-genmodel.jar --rows 2000
+
+With --write-fixture the rows and PredictCsv's predictions are saved as the
+fixture tests/test_xgb_mojo.py checks the scorer against (no JVM needed):
+
+    python mojo_parity.py --rows 500 --write-fixture tests/fixtures/mojo_predictcsv.csv
+"""
+import argparse
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+from app.xgb_mojo import XGBoostMojo
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MOJO = os.path.join(BASE_DIR, "model", "XGBoost_model_python_1757147613340_1.zip")
+DEFAULT_JAR = os.path.join(BASE_DIR, "model", "h2o-genmodel.jar")
+
+# Rough value ranges for the numeric model columns
+NUMERIC_RANGES = {
+    "MONTH": (1, 12), "DAY": (1, 31), "DAY_OF_WEEK": (1, 7),
+    "FLIGHT_NUMBER": (1, 7000), "SCHEDULED_DEPARTURE": (0, 2359),
+    "DEPARTURE_TIME": (0, 2359), "DEPARTURE_DELAY": (-30, 600),
+    "TAXI_OUT": (0, 90), "SCHEDULED_TIME": (20, 700), "DISTANCE": (30, 5000),
+    "SCHEDULED_ARRIVAL": (0, 2359), "is_holiday": (0, 1), "is_redeye": (0, 1),
+    "DEP_TIME_DIFF": (-30, 1440), "ROUTE_AVG_ARR_DELAY": (-30, 120),
+    "AIRLINE_AVG_ARR_DELAY": (-10, 30), "FLIGHT_AVG_ARR_DELAY": (-30, 200),
+    "is_weekend": (0, 1),
+}
+
+
+def synthetic_rows(model: XGBoostMojo, n: int, seed: int) -> list:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        row = {}
+        for col, domain in zip(model.cat_columns, model.domains):
+            r = rng.random()
+            row[col] = "" if r < 0.1 else "ZZ_UNSEEN" if r < 0.15 else rng.choice(domain)
+        for col in model.num_columns:
+            lo, hi = NUMERIC_RANGES.get(col, (0, 100))
+            r = rng.random()
+            if r < 0.1:
+                row[col] = ""
+            elif r < 0.15:
+                row[col] = "0"
+            elif col.endswith("AVG_ARR_DELAY"):
+                row[col] = repr(rng.uniform(lo, hi))
+            else:
+                row[col] = str(rng.randint(lo, hi))
+        rows.append(row)
+    return rows
+
+
+def predict_csv(jar: str, mojo: str, columns: list, rows: list) -> list:
+    with tempfile.TemporaryDirectory() as tmp:
+        in_path = os.path.join(tmp, "in.csv")
+        out_path = os.path.join(tmp, "out.csv")
+        with open(in_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow([row.get(c, "") for c in columns])
+        subprocess.run(
+            ["java", "-cp", jar, "hex.genmodel.tools.PredictCsv",
+             "--mojo", mojo, "--input", in_path, "--output", out_path, "--decimal"],
+            check=True, capture_output=True, text=True,
+        )
+        with open(out_path) as f:
+            lines = f.read().splitlines()[1:]
+    return [float(line.split(",")[-1]) for line in lines]
+
+
+def write_fixture(path: str, columns: list, rows: list, expected: list):
+    """Model input rows plus PredictCsv's prediction, as a CSV."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*columns, "predict"])
+        for row, pred in zip(rows, expected):
+            writer.writerow([*(row.get(c, "") for c in columns), repr(pred)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mojo", default=os.getenv("MOJO_MODEL_PATH", DEFAULT_MOJO))
+    parser.add_argument("--jar", default=os.getenv("MOJO_JAR_PATH", DEFAULT_JAR))
+    parser.add_argument("--input", help="CSV of rows to compare (default: synthetic sample)")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--write-fixture", metavar="PATH", help="Also save rows and PredictCsv output to PATH")
+    args = parser.parse_args()
+
+    model = XGBoostMojo.load(args.mojo)
+    if args.input:
+        with open(args.input, newline="") as f:
+            rows = list(csv.DictReader(f))[: args.rows]
+        columns = list(rows[0].keys()) if rows else model.columns
+    else:
+        rows = synthetic_rows(model, args.rows, args.seed)
+        columns = model.columns
+
+    expected = predict_csv(args.jar, args.mojo, columns, rows)
+    if args.write_fixture:
+        write_fixture(args.write_fixture, columns, rows, expected)
+        print(f"[INFO] Wrote {len(rows)} rows to {args.write_fixture}")
+    actual = model.predict(rows)
+
+    mismatches = [
+        (i, e, a) for i, (e, a) in enumerate(zip(expected, actual)) if e != a
+    ]
+    max_diff = max((abs(e - a) for _, e, a in mismatches), default=0.0)
+    print(f"[INFO] Compared {len(rows)} rows: {len(mismatches)} mismatches, max abs diff {max_diff}")
+    for i, e, a in mismatches[:10]:
+        print(f"  row {i}: PredictCsv={e!r} numpy={a!r}")
+    if mismatches or len(expected) != len(actual):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
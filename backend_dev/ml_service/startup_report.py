@@ -0,0 +1,71 @@
+"""
+Import-time and startup-time report for the ML service.
+
+Imports app.main in a fresh interpreter with -X importtime, runs the app's
+startup (lifespan) once, and prints the slowest imports together with the
+service's own STARTUP_REPORT.
+
+    python startup_report.py --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from app.main import app, STARTUP_REPORT
+t1 = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        t2 = time.perf_counter()
+        print(json.dumps({"import": t1 - t0, "ready": t2 - t0, "report": STARTUP_REPORT}))
+
+asyncio.run(boot())
+"""
+
+
+def slowest_imports(stderr: str, top: int) -> list:
+    """(cumulative seconds, module) for the top-level slowest imports."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative) / 1e6, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": BASE_DIR}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith("{"):
+            result = json.loads(line)
+    if proc.returncode != 0 or result is None:
+        print(proc.stderr[-2000:])
+        sys.exit(1)
+
+    print(f"[INFO] import app.main: {result['import']:.3f}s, ready to serve: {result['ready']:.3f}s")
+    print("[INFO] Startup report:", json.dumps(result["report"], indent=2))
+    print("[INFO] Slowest imports (cumulative, -X importtime adds overhead):")
+    for seconds, name in slowest_imports(proc.stderr, args.top):
+        print(f"  {seconds:8.3f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
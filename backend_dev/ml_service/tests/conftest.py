@@ -0,0 +1,34 @@
+"""Fixtures shared by the test modules."""
+import random
+from decimal import Decimal
+
+import pytest
+
+AIRLINES = ["AA", "DL", "UA", "WN", "B6", "AS", "NK", "HA", "OO", "EV"]
+AIRPORTS = ["ATL", "ORD", "DFW", "DEN", "LAX", "SFO", "SEA", "JFK", "BOS", "MIA", "PHX", "LAS"]
+
+
+def flight_record(rng: random.Random, flight_number: int) -> dict:
+    """A plausible final_db_schema row, prediction included."""
+    sched = rng.randint(0, 23) * 100 + rng.randrange(0, 60, 5)
+    delay = rng.randint(-15, 120)
+    return {
+        "YEAR": 2015, "MONTH": rng.randint(1, 12), "DAY": rng.randint(1, 28),
+        "DAY_OF_WEEK": rng.randint(1, 7), "AIRLINE": rng.choice(AIRLINES),
+        "FLIGHT_NUMBER": flight_number,
+        "ORIGIN_AIRPORT": rng.choice(AIRPORTS), "DESTINATION_AIRPORT": rng.choice(AIRPORTS),
+        "SCHEDULED_DEPARTURE": sched, "DEPARTURE_TIME": (sched + delay) % 2400,
+        "DEPARTURE_DELAY": delay, "TAXI_OUT": rng.randint(5, 45),
+        "SCHEDULED_TIME": rng.randint(45, 400), "DISTANCE": rng.randint(80, 2800),
+        "SCHEDULED_ARRIVAL": rng.randint(0, 2359),
+        "ARRIVAL_DELAY_PREDICTED": Decimal(rng.randint(-300, 3000)) / 10,
+    }
+
+
+@pytest.fixture
+def flight_records():
+    """flight_records(n, seed=0): n rows with distinct flight numbers, so distinct keys."""
+    def make(n: int, seed: int = 0) -> list:
+        rng = random.Random(seed)
+        return [flight_record(rng, i) for i in range(n)]
+    return make
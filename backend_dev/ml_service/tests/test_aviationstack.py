@@ -0,0 +1,102 @@
+"""AviationStackClient against the fake AviationStack API (fake_aviationstack.py)."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.aviationstack import AviationStackClient, UpstreamError
+from fake_aviationstack import create_app
+
+
+def client_for(app, **kwargs) -> AviationStackClient:
+    client = AviationStackClient("http://fake/v1/flights", "test-key", **kwargs)
+    client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    return client
+
+
+def fake_stats(app) -> dict:
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://fake") as http:
+            return (await http.get("/stats")).json()
+    return asyncio.run(get())
+
+
+def test_concurrent_lookups_share_one_request():
+    fake = create_app(latency_ms=50)
+    client = client_for(fake)
+
+    async def run():
+        flights = await asyncio.gather(*(client.flight(" aa10 ") for _ in range(20)))
+        again = await client.flight("AA10")
+        await client.close()
+        return flights, again
+
+    flights, again = asyncio.run(run())
+    assert all(f == flights[0] for f in flights) and flights[0]["flight"]["number"] == "10"
+    assert again == flights[0]
+    assert fake_stats(fake)["requests"] == 1
+    assert client.coalesced == 19
+    assert client.hits == 1
+
+
+def test_not_found_is_cached():
+    fake = create_app(not_found_rate=1.0)
+    client = client_for(fake)
+
+    async def run():
+        return await client.flight("XX1"), await client.flight("XX1")
+
+    assert asyncio.run(run()) == (None, None)
+    assert fake_stats(fake)["requests"] == 1
+
+
+def test_upstream_errors_are_not_cached():
+    fake = create_app(error_rate=1.0)
+    client = client_for(fake)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(UpstreamError, match="HTTP 500"):
+                await client.flight("AA10")
+
+    asyncio.run(run())
+    assert fake_stats(fake)["requests"] == 2
+    assert client.stats()["cached_flights"] == 0
+    assert client.upstream_errors == 2
+
+
+def test_ok_response_without_data_is_an_error():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"error": {"code": "usage_limit_reached"}})
+
+    client = AviationStackClient("http://fake/v1/flights", "test-key")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(UpstreamError, match="usage_limit_reached"):
+                await client.flight("AA10")
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert client.stats()["cached_flights"] == 0
+
+
+def test_cache_never_exceeds_max_cached():
+    fake = create_app()
+    client = client_for(fake, max_cached=3)
+
+    async def run():
+        for n in range(1, 7):
+            await client.flight(f"AA{n}")
+        cached = list(client._cache)
+        # The newest entries are kept and still served from cache
+        await client.flight("AA6")
+        return cached
+
+    assert asyncio.run(run()) == ["AA4", "AA5", "AA6"]
+    assert client.stats()["cached_flights"] == 3
+    assert fake_stats(fake)["requests"] == 6
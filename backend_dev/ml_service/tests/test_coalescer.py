@@ -0,0 +1,92 @@
+"""BatchCoalescer: batching, the in-flight batch limit and cancellation."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.coalescer import BatchCoalescer
+
+
+class Scorer:
+    """score_batch that doubles each row and records its batches."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches = []
+        self.running = self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, rows: list) -> list:
+        with self._lock:
+            self.batches.append(list(rows))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return [row * 2 for row in rows]
+
+
+def test_concurrent_rows_are_scored_in_batches():
+    scorer = Scorer()
+    coalescer = BatchCoalescer(scorer, window_ms=50, max_batch=4)
+
+    async def run():
+        results = await asyncio.gather(*(coalescer.submit(i) for i in range(10)))
+        await coalescer.stop()
+        return results
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    assert [len(b) for b in scorer.batches] == [4, 4, 2]
+    assert sorted(r for b in scorer.batches for r in b) == list(range(10))
+    assert coalescer.batch_size.count == 3
+    assert coalescer.queue_wait_ms.count == 10
+
+
+def test_max_inflight_limits_concurrent_batches():
+    scorer = Scorer(delay=0.05)
+    coalescer = BatchCoalescer(scorer, window_ms=0, max_batch=1, max_inflight=2)
+
+    async def run():
+        results = await asyncio.gather(*(coalescer.submit(i) for i in range(8)))
+        await coalescer.stop()
+        return results
+
+    assert asyncio.run(run()) == [i * 2 for i in range(8)]
+    assert len(scorer.batches) == 8
+    assert scorer.max_running == 2
+
+
+def test_cancelled_rows_are_not_scored():
+    scorer = Scorer()
+    coalescer = BatchCoalescer(scorer, window_ms=100, max_batch=8)
+
+    async def run():
+        kept = asyncio.create_task(coalescer.submit(1))
+        dropped = asyncio.create_task(coalescer.submit(2))
+        await asyncio.sleep(0.01)
+        dropped.cancel()
+        result = await kept
+        await coalescer.stop()
+        return result, dropped
+
+    result, dropped = asyncio.run(run())
+    assert result == 2
+    assert dropped.cancelled()
+    assert scorer.batches == [[1]]
+
+
+def test_stop_fails_rows_of_the_batch_being_collected():
+    scorer = Scorer()
+    coalescer = BatchCoalescer(scorer, window_ms=10_000, max_batch=8)
+
+    async def run():
+        waiting = asyncio.create_task(coalescer.submit(1))
+        await asyncio.sleep(0.01)
+        await coalescer.stop()
+        return await asyncio.wait_for(waiting, 1)
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        asyncio.run(run())
+    assert scorer.batches == []
@@ -0,0 +1,56 @@
+"""
+/predictions first pages scan their page-order index, on Postgres.
+
+Runs against DATABASE_URL once migrations are applied (as in CI) and is
+skipped on other databases. Rows are seeded into a few monthly partitions
+inside a transaction that is rolled back. min_delay has no index of its
+own: it must be a Filter on the page-order index scan.
+"""
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.predictions import T, predictions_query
+from explain_predictions import CASES, plan_problems, sample_values, sql
+
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL.startswith("postgresql"), reason="needs a Postgres DATABASE_URL"
+)
+
+# Far from any real data, so seeded keys cannot collide with stored rows
+MONTHS = [(2099, 1), (2099, 2), (2099, 3)]
+
+
+async def first_page_problems(rows: list) -> dict:
+    engine = create_async_engine(make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"))
+    try:
+        async with engine.connect() as conn:
+            async with conn.begin() as tx:
+                for year, month in MONTHS:
+                    await conn.execute(text("SELECT final_db_schema_add_month(:y, :m)"), {"y": year, "m": month})
+                await conn.execute(insert(T).on_conflict_do_nothing(), rows)
+                values = await sample_values(conn)
+                found = {}
+                for name, filters, supporting in CASES:
+                    query = sql(predictions_query(**{k: values[v] for k, v in filters.items()}, limit=100))
+                    filtered = "ARRIVAL_DELAY_PREDICTED" if "min_delay" in filters else None
+                    found[name] = await plan_problems(conn, query, supporting, filtered)
+                await tx.rollback()
+    finally:
+        await engine.dispose()
+    return found
+
+
+def test_first_pages_use_supporting_index(flight_records):
+    rows = flight_records(3000)
+    for i, row in enumerate(rows):
+        row["YEAR"], row["MONTH"] = MONTHS[i % len(MONTHS)]
+    problems = {name: p for name, p in asyncio.run(first_page_problems(rows)).items() if p}
+    assert problems == {}
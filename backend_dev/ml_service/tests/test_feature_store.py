@@ -0,0 +1,49 @@
+"""FeatureStore lookups, including keys the store has never seen."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.feature_store import FEATURES, FeatureStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "store.npz"
+    np.savez(
+        path,
+        **{"ROUTE_AVG_ARR_DELAY.keys": np.array(["ATL_ORD"]), "ROUTE_AVG_ARR_DELAY.values": np.array([4.0]),
+           "AIRLINE_AVG_ARR_DELAY.keys": np.array(["AA"]), "AIRLINE_AVG_ARR_DELAY.values": np.array([2.0]),
+           "FLIGHT_AVG_ARR_DELAY.keys": np.array([10]), "FLIGHT_AVG_ARR_DELAY.values": np.array([7.0])},
+    )
+    store = FeatureStore(str(path))
+    store.load()
+    return store
+
+
+def frame(origin, dest, airline=None, flight=None):
+    n = len(origin)
+    return pd.DataFrame({
+        "ORIGIN_AIRPORT": origin,
+        "DESTINATION_AIRPORT": dest,
+        "AIRLINE": airline or ["AA"] * n,
+        "FLIGHT_NUMBER": flight or [10] * n,
+    })
+
+
+def test_known_and_unknown_keys(store):
+    out = store.features(frame(["ATL", "ATL", "SFO"], ["ORD", "SFO", "ORD"], ["AA", "ZZ", "AA"], [10, 10, 99]))
+    np.testing.assert_array_equal(out["ROUTE_AVG_ARR_DELAY"], [4.0, np.nan, np.nan])
+    np.testing.assert_array_equal(out["AIRLINE_AVG_ARR_DELAY"], [2.0, np.nan, 2.0])
+    np.testing.assert_array_equal(out["FLIGHT_AVG_ARR_DELAY"], [7.0, 7.0, np.nan])
+
+
+@pytest.mark.parametrize("origin, dest", [
+    (["ATL", None], [None, None]),  # every destination missing
+    ([None, None], ["ORD", "SFO"]),  # every origin missing
+    ([], []),
+])
+def test_missing_airports_give_unknown_routes(store, origin, dest):
+    out = store.features(frame(origin, dest))
+    assert set(out) == set(FEATURES)
+    assert len(out["ROUTE_AVG_ARR_DELAY"]) == len(origin)
+    assert np.isnan(out["ROUTE_AVG_ARR_DELAY"]).all()
@@ -0,0 +1,15 @@
+"""
+Vectorized feature engineering (app.features) against the original row-wise
+implementation kept in features_parity.py, on fixed synthetic samples.
+"""
+import pandas as pd
+import pytest
+
+from app.features import engineer_features
+from features_parity import legacy_features, synthetic_frame
+
+
+@pytest.mark.parametrize("seed", [0, 42])
+def test_engineer_features_matches_row_wise(seed):
+    df = synthetic_frame(5000, seed)
+    pd.testing.assert_frame_equal(engineer_features(df.copy()), legacy_features(df.copy()))
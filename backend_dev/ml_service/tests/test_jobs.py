@@ -0,0 +1,166 @@
+"""Batch job queue on SQLite: claiming, ownership of the result file and resuming."""
+import asyncio
+import datetime
+import json
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import jobs
+from app.jobs import JobWorker, LostJob
+from databases.models import Base
+
+CSV = (
+    "FLIGHT_NUMBER,NOTE\n"
+    '1,"first\nline"\n'
+    "2,plain\n"
+    '3,"a\n\nb"\n'
+    "4,plain\n"
+    '5,"x\ny"\n'
+    "6,plain\n"
+    "7,last\n"
+)
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    """Run a coroutine against a fresh job table and JOB_DIR."""
+    monkeypatch.setattr(jobs, "JOB_DIR", str(tmp_path))
+
+    def run(test):
+        async def main():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session = async_sessionmaker(engine, expire_on_commit=False)
+            monkeypatch.setattr(jobs, "AsyncSessionLocal", session)
+            try:
+                return await test(session)
+            finally:
+                await engine.dispose()
+        return asyncio.run(main())
+    return run
+
+
+async def submit(session, job_id: str, chunk_rows: int = 2, csv: str = CSV) -> dict:
+    with open(jobs.input_path(job_id), "w") as f:
+        f.write(csv)
+    async with session() as db:
+        return await jobs.create(db, job_id, "echo", f"{job_id}.csv", chunk_rows, 7)
+
+
+def echo_handler(after_chunk=None):
+    """Writes one NDJSON line per row and commits, like the app's handlers."""
+    async def handler(db, df, offset, record):
+        lines = "".join(
+            json.dumps({"row": offset + i, "flight": int(r.FLIGHT_NUMBER), "note": r.NOTE}) + "\n"
+            for i, r in enumerate(df.itertuples())
+        )
+        await record(db, lines)
+        await db.commit()
+        if after_chunk:
+            after_chunk()
+    return handler
+
+
+def make_worker(name: str, handler=None) -> JobWorker:
+    """A worker driven by the test instead of run()."""
+    worker = JobWorker({"echo": handler or echo_handler()}, name=name)
+    worker.stopping = asyncio.Event()
+    return worker
+
+
+def read_result(job_id: str) -> list:
+    with open(jobs.result_path(job_id)) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_only_one_worker_claims_a_job(queue):
+    async def test(session):
+        await submit(session, "j1")
+        workers = [make_worker(f"w{i}") for i in range(5)]
+        claimed = await asyncio.gather(*(w.claim() for w in workers))
+        again = await workers[0].claim()
+        async with session() as db:
+            return claimed, again, dict(await jobs.get(db, "j1"))
+
+    claimed, again, job = queue(test)
+    owners = [c for c in claimed if c is not None]
+    assert len(owners) == 1 and again is None
+    assert job["status"] == "running" and job["worker"] == owners[0]["worker"]
+    assert job["attempts"] == 1
+
+
+def test_stale_job_is_reclaimed(queue):
+    async def test(session):
+        await submit(session, "j1")
+        first = await make_worker("w1").claim()
+        fresh = await make_worker("w2").claim()
+        old = jobs.utcnow() - datetime.timedelta(seconds=jobs.JOB_STALE_SECONDS + 1)
+        async with session() as db:
+            await db.execute(update(jobs.T).where(jobs.T.c.id == "j1").values(heartbeat_at=old))
+            await db.commit()
+        return first, fresh, await make_worker("w2").claim()
+
+    first, fresh, stale = queue(test)
+    assert first["worker"] == "w1" and fresh is None
+    assert stale["worker"] == "w2" and stale["attempts"] == 2
+
+
+def test_lost_job_does_not_touch_result_file(queue):
+    async def test(session):
+        await submit(session, "j1")
+        worker = make_worker("w1")
+        job = await worker.claim()
+        with open(jobs.result_path("j1"), "wb") as f:
+            f.write(b"written by w2\n")
+        # Another worker reclaims the job while w1 is still running it
+        async with session() as db:
+            await db.execute(update(jobs.T).where(jobs.T.c.id == "j1").values(worker="w2"))
+            await db.commit()
+        with pytest.raises(LostJob):
+            await worker._run_chunk(job, jobs.pd.read_csv(jobs.input_path("j1")).iloc[:2])
+        async with session() as db:
+            return dict(await jobs.get(db, "j1"))
+
+    job = queue(test)
+    assert job["rows_done"] == 0 and job["worker"] == "w2"
+    with open(jobs.result_path("j1"), "rb") as f:
+        assert f.read() == b"written by w2\n"
+
+
+def test_stopped_job_resumes_after_last_committed_record(queue):
+    async def test(session):
+        await submit(session, "whole")
+        whole = make_worker("w1")
+        await whole.run_job(await whole.claim())
+
+        await submit(session, "j1")
+        chunks = []
+
+        def stop_after_two():
+            chunks.append(1)
+            if len(chunks) == 2:
+                worker.stopping.set()
+
+        worker = make_worker("w1", echo_handler(stop_after_two))
+        await worker.run_job(await worker.claim())
+        async with session() as db:
+            stopped = dict(await jobs.get(db, "j1"))
+        # A crash while writing the next chunk leaves bytes past result_bytes
+        with open(jobs.result_path("j1"), "ab") as f:
+            f.write(b'{"row": 4, "partial' + b" " * 4096)
+
+        resumer = make_worker("w2")
+        await resumer.run_job(await resumer.claim())
+        async with session() as db:
+            return stopped, dict(await jobs.get(db, "j1"))
+
+    stopped, done = queue(test)
+    assert (stopped["status"], stopped["rows_done"]) == ("queued", 4)
+    assert (done["status"], done["rows_done"], done["attempts"]) == ("done", 7, 2)
+    rows = read_result("j1")
+    assert rows == read_result("whole")
+    assert [r["flight"] for r in rows] == list(range(1, 8))
+    assert rows[4]["note"] == "x\ny"
@@ -0,0 +1,58 @@
+"""Lazy: a failed factory is not re-run until its retry time."""
+import pytest
+
+from app import lazy
+from app.lazy import STARTUP_REPORT, Lazy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_failure_is_cached_until_retry(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(lazy.time, "monotonic", clock)
+    calls = []
+
+    def factory():
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise RuntimeError(f"down {len(calls)}")
+        return "up"
+
+    sub = Lazy("test_flaky", factory, retry_seconds=10)
+    for _ in range(3):
+        with pytest.raises(RuntimeError, match="down 1"):
+            sub.get()
+    assert sub.get_or_none() is None
+    assert len(calls) == 1
+    assert STARTUP_REPORT["subsystems"]["test_flaky"] == {"ready": False, "error": "down 1"}
+
+    clock.now += 10
+    with pytest.raises(RuntimeError, match="down 2"):
+        sub.get()
+    clock.now += 10
+    assert sub.get() == "up" and sub.get() == "up"
+    assert len(calls) == 3
+    assert STARTUP_REPORT["subsystems"]["test_flaky"]["ready"] is True
+    STARTUP_REPORT["subsystems"].pop("test_flaky")
+
+
+def test_reset_forgets_failure():
+    outcomes = [RuntimeError("down"), "up"]
+
+    def factory():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    sub = Lazy("test_reset", factory, retry_seconds=3600)
+    assert sub.get_or_none() is None
+    sub.reset()
+    assert sub.get() == "up"
+    STARTUP_REPORT["subsystems"].pop("test_reset")
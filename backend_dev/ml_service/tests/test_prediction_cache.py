@@ -0,0 +1,95 @@
+"""PredictionCache keys, LRU/TTL eviction and MOJO change detection."""
+import os
+
+import pytest
+
+from app import prediction_cache
+from app.prediction_cache import FileDigest, PredictionCache, features_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_features_key_ignores_order_and_includes_model():
+    a = {"AIRLINE": "AA", "FLIGHT_NUMBER": 10, "DISTANCE": 500.0}
+    b = {"DISTANCE": 500.0, "AIRLINE": "AA", "FLIGHT_NUMBER": 10}
+    assert features_key(a, "m1") == features_key(b, "m1")
+    assert features_key(a, "m1") != features_key(a, "m2")
+    assert features_key(a, "m1") != features_key({**a, "FLIGHT_NUMBER": 11}, "m1")
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_entries=10, ttl_seconds=5)
+    cache.put("k", 1.5)
+    clock.now += 4.9
+    assert cache.get("k") == 1.5
+    clock.now += 0.2
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_zero_disables_cache(clock):
+    cache = PredictionCache(max_entries=0)
+    cache.put("k", 1)
+    assert cache.get("k") is None
+
+
+def test_new_model_digest_clears_entries(clock):
+    cache = PredictionCache()
+    assert cache.set_model("m1") is False
+    cache.put("k", 1)
+    assert cache.set_model("m1") is False
+    assert cache.get("k") == 1
+    assert cache.set_model("m2") is True
+    assert cache.get("k") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_file_digest_changes_with_mojo_file(tmp_path, clock):
+    path = tmp_path / "model.zip"
+    path.write_bytes(b"model v1")
+    digest = FileDigest(str(path), check_interval=1.0)
+    first = digest.digest()
+
+    path.write_bytes(b"model v2, longer")
+    # Not re-checked within check_interval
+    assert digest.digest() == first
+    clock.now += 1.0
+    second = digest.digest()
+    assert second != first
+
+    # Same size, new mtime: re-hashed
+    path.write_bytes(b"model v3, longer")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    clock.now += 1.0
+    assert digest.digest() not in (first, second)
+
+    cache = PredictionCache()
+    cache.set_model(first)
+    cache.put(features_key({"AIRLINE": "AA"}, first), 4.0)
+    assert cache.set_model(digest.digest()) is True
+    assert cache.stats()["size"] == 0
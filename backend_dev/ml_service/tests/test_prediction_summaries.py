@@ -0,0 +1,104 @@
+"""Per-airline summary tables on SQLite, against a full scan of the same rows."""
+import asyncio
+from decimal import Decimal
+
+import polars as pl
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.analytics import collect_reports
+from app.prediction_summaries import SUMMARIES, add_to_summaries, airline_report, summary_deltas
+from databases.models import Base
+
+BLOCKS = ["worst_routes", "worst_flights", "delay_by_day", "top_airports", "losing_routes", "hour_vs_delay"]
+
+
+def record(airline, origin, dest, flight, day, dep, delay):
+    return {
+        "AIRLINE": airline, "ORIGIN_AIRPORT": origin, "DESTINATION_AIRPORT": dest, "FLIGHT_NUMBER": flight,
+        "DAY_OF_WEEK": day, "SCHEDULED_DEPARTURE": dep, "ARRIVAL_DELAY_PREDICTED": Decimal(delay),
+    }
+
+
+def test_summary_deltas_sum_and_count_per_key():
+    deltas = summary_deltas([
+        record("AA", "ATL", "ORD", 10, 1, 905, "10.5"),
+        record("AA", "ATL", "ORD", 11, 1, 930, "-2.5"),
+        record("AA", "LAX", "SFO", 10, 3, 1400, "4"),
+    ])
+    tables = {table.name: rows for table, rows in deltas.items()}
+    assert tables["prediction_route_summary"] == [
+        {"AIRLINE": "AA", "ORIGIN_AIRPORT": "ATL", "DESTINATION_AIRPORT": "ORD",
+         "delay_sum": Decimal("8.0"), "delay_count": 2},
+        {"AIRLINE": "AA", "ORIGIN_AIRPORT": "LAX", "DESTINATION_AIRPORT": "SFO",
+         "delay_sum": Decimal("4"), "delay_count": 1},
+    ]
+    assert [(r["FLIGHT_NUMBER"], r["delay_count"]) for r in tables["prediction_flight_summary"]] == [(10, 2), (11, 1)]
+    assert [(r["DEP_HOUR"], r["delay_sum"]) for r in tables["prediction_hour_summary"]] == [
+        (9, Decimal("8.0")), (14, Decimal("4")),
+    ]
+
+
+@pytest.fixture
+def records(flight_records):
+    rows = flight_records(3000)
+    for row in rows:
+        # Few flights per airline, so flight rollups aggregate several rows
+        row["FLIGHT_NUMBER"] %= 40
+    return rows
+
+
+async def stored_reports(url: str, chunks: list, airline: str):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine, expire_on_commit=False)
+    for chunk in chunks:
+        async with session() as db:
+            await add_to_summaries(db, chunk)
+            await db.commit()
+    async with session() as db:
+        summaries = {
+            table.name: (await db.execute(select(table))).mappings().all() for table in SUMMARIES
+        }
+        report = await airline_report(db, airline)
+    await engine.dispose()
+    return summaries, report
+
+
+def test_summaries_match_full_scan(tmp_path, records):
+    frame = pl.DataFrame(
+        [{**r, "ARRIVAL_DELAY_PREDICTED": float(r["ARRIVAL_DELAY_PREDICTED"])} for r in records]
+    )
+    airline = frame["AIRLINE"].mode()[0]
+    # Chunks share keys, so later chunks go through ON CONFLICT DO UPDATE
+    chunks = [records[i:i + 700] for i in range(0, len(records), 700)]
+    summaries, report = asyncio.run(
+        stored_reports(f"sqlite+aiosqlite:///{tmp_path / 'summaries.db'}", chunks, airline)
+    )
+
+    routes = frame.group_by("AIRLINE", "ORIGIN_AIRPORT", "DESTINATION_AIRPORT").agg(
+        pl.col("ARRIVAL_DELAY_PREDICTED").sum().alias("delay_sum"), pl.len().alias("delay_count")
+    )
+    stored = pl.DataFrame(
+        [{**r, "delay_sum": float(r["delay_sum"])} for r in summaries["prediction_route_summary"]]
+    )
+    joined = routes.join(stored, on=["AIRLINE", "ORIGIN_AIRPORT", "DESTINATION_AIRPORT"], how="full")
+    assert len(joined) == len(routes) == len(stored)
+    assert (joined["delay_count"] == joined["delay_count_right"]).all()
+    assert ((joined["delay_sum"] - joined["delay_sum_right"]).abs() < 1e-6).all()
+
+    expected = collect_reports(
+        frame.lazy().with_columns(
+            pl.col("ARRIVAL_DELAY_PREDICTED").alias("ARRIVAL_DELAY"), pl.lit(10).alias("TAXI_OUT")
+        ),
+        airline,
+        engine="in-memory",
+    )[airline]
+    for block in BLOCKS:
+        assert len(report[block]) == len(expected[block]), block
+        # Summaries round averages to 10 places; approx does not nest, so compare per row
+        for got, want in zip(report[block], expected[block]):
+            assert got == pytest.approx(want, abs=1e-9), block
+    assert report["vulnerable_days"] == report["delay_by_day"]
@@ -0,0 +1,74 @@
+"""Profiles of a request include the threads doing its work."""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app import server_timing
+from app.server_timing import ServerTimingMiddleware, profiled, run_in_threadpool
+
+
+def spin(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def threadpool_work():
+    spin(0.2)
+
+
+def other_request_work():
+    spin(0.4)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(server_timing, "PROFILE_HEADER", b"x-profile")
+    monkeypatch.setattr(server_timing, "PROFILE_INTERVAL_MS", 1)
+    monkeypatch.setattr(server_timing, "PROFILE_DIR", str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/async")
+    async def async_endpoint():
+        await run_in_threadpool(threadpool_work)
+        return {}
+
+    @app.get("/sync")
+    @profiled
+    def sync_endpoint():
+        threadpool_work()
+        return {}
+
+    @app.get("/other")
+    async def other():
+        await run_in_threadpool(other_request_work)
+        return {}
+
+    return app
+
+
+def profile_of(app, tmp_path, path: str) -> str:
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # An unprofiled request runs threadpool work at the same time
+            other = asyncio.create_task(client.get("/other"))
+            response = await client.get(path, headers={"x-profile": "1"})
+            await other
+        return response
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    (out,) = tmp_path.glob("*.folded")
+    return out.read_text()
+
+
+@pytest.mark.parametrize("path", ["/async", "/sync"])
+def test_profile_has_threadpool_frames(app, tmp_path, path):
+    profile = profile_of(app, tmp_path, path)
+    assert "threadpool_work (test_server_timing.py" in profile
+    assert "other_request_work" not in profile
@@ -0,0 +1,43 @@
+"""
+The NumPy MOJO scorer against H2O's own PredictCsv output for the shipped
+model (tests/fixtures/mojo_predictcsv.csv, written by mojo_parity.py).
+"""
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.xgb_mojo import XGBoostMojo
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOJO = os.path.join(BASE_DIR, "model", "XGBoost_model_python_1757147613340_1.zip")
+FIXTURE = os.path.join(BASE_DIR, "tests", "fixtures", "mojo_predictcsv.csv")
+
+# PredictCsv scores in float32
+RTOL, ATOL = 1e-6, 1e-5
+
+
+@pytest.fixture(scope="module")
+def model():
+    return XGBoostMojo.load(MOJO)
+
+
+@pytest.fixture(scope="module")
+def fixture_rows():
+    with open(FIXTURE, newline="") as f:
+        rows = list(csv.DictReader(f))
+    expected = np.array([float(row.pop("predict")) for row in rows])
+    return rows, expected
+
+
+def test_predict_matches_predictcsv(model, fixture_rows):
+    rows, expected = fixture_rows
+    np.testing.assert_allclose(model.predict(rows), expected, rtol=RTOL, atol=ATOL)
+
+
+def test_predict_frame_matches_predictcsv(model, fixture_rows):
+    _, expected = fixture_rows
+    df = pd.read_csv(FIXTURE, dtype={col: str for col in model.cat_columns}).drop(columns="predict")
+    np.testing.assert_allclose(model.predict_frame(df), expected, rtol=RTOL, atol=ATOL)